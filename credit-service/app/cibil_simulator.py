@@ -1,5 +1,8 @@
+import functools
 import logging
 import random
+import sys
+from array import array
 
 logger = logging.getLogger(__name__)
 
@@ -15,15 +18,27 @@ class CIBILSimulator:
 
     # Test PAN numbers with predefined scores
     TEST_PANS = {
-        "ABCDE1234F": 790,  # Test PAN 1 - Good credit
-        "FGHIJ5678K": 610,  # Test PAN 2 - Below average credit
+        sys.intern("ABCDE1234F"): 790,  # Test PAN 1 - Good credit
+        sys.intern("FGHIJ5678K"): 610,  # Test PAN 2 - Below average credit
     }
+    _TEST_PAN_SET = frozenset(TEST_PANS)
 
     # Score boundaries
     MIN_SCORE = 300
     MAX_SCORE = 900
     BASE_SCORE = 650
 
+    # Score adjustments indexed by income bucket: low (<30000), normal, high (>75000)
+    INCOME_ADJUSTMENTS = (-20, 0, 40)
+
+    # Score adjustments by loan type: unsecured loans are penalised, secured loans get a bonus
+    LOAN_TYPE_ADJUSTMENTS = {"PERSONAL": -10, "HOME": 10}
+
+    # Random variation (-5 to +5) is drawn in bulk into a pool that is refilled on wraparound
+    JITTER_POOL_SIZE = 4096
+    _jitter_pool = array("b")
+    _jitter_index = 0
+
     @classmethod
     def calculate_cibil_score(cls, pan_number: str, monthly_income: float, loan_type: str) -> int:
         """
@@ -38,40 +53,65 @@ class CIBILSimulator:
             CIBIL score (300-900)
         """
         # Check if this is a test PAN
-        if pan_number in cls.TEST_PANS:
+        if pan_number in cls._TEST_PAN_SET:
             score = cls.TEST_PANS[pan_number]
-            logger.info(f"Using predefined CIBIL score for test PAN {pan_number}: {score}")
+            logger.info("Using predefined CIBIL score for test PAN %s: %s", pan_number, score)
             return score
 
-        # Default logic for all other PANs
-        score = cls.BASE_SCORE
-
-        # Income-based adjustments
-        if monthly_income > 75000:
-            score += 40
-            logger.debug(f"High income ({monthly_income}) bonus: +40 points")
-        elif monthly_income < 30000:
-            score -= 20
-            logger.debug(f"Low income ({monthly_income}) penalty: -20 points")
-
-        # Loan type adjustments
-        loan_type_upper = loan_type.upper()
-
-        if loan_type_upper == "PERSONAL":
-            score -= 10  # Unsecured loan
-            logger.debug("Personal loan (unsecured) penalty: -10 points")
-        elif loan_type_upper == "HOME":
-            score += 10  # Secured loan
-            logger.debug("Home loan (secured) bonus: +10 points")
+        # Default logic for all other PANs: the income/loan type part of the score is
+        # deterministic, so it is cached per (income bucket, loan type) pair and the
+        # table lookups only run on a cache miss; loan types are upper-cased first so
+        # case variants share one cache entry
+        income_bucket = 0 if monthly_income < 30000 else 2 if monthly_income > 75000 else 1
+        score = cls._deterministic_score(income_bucket, loan_type.upper())
 
         # Add random variation to make it realistic (-5 to +5)
-        random_adjustment = random.randint(-5, 5)
+        random_adjustment = cls._next_jitter()
         score += random_adjustment
-        logger.debug(f"Random adjustment: {random_adjustment:+d} points")
+        logger.debug("Random adjustment: %+d points", random_adjustment)
 
         # Ensure score is within valid range (300-900)
         score = max(cls.MIN_SCORE, min(cls.MAX_SCORE, score))
 
-        logger.info(f"Calculated CIBIL score for PAN {pan_number}: {score} (income: {monthly_income}, loan_type: {loan_type})")
+        logger.info(
+            "Calculated CIBIL score for PAN %s: %s (income: %s, loan_type: %s)", pan_number, score, monthly_income, loan_type
+        )
 
         return score
+
+    @classmethod
+    def _next_jitter(cls) -> int:
+        """
+        Return the next random adjustment (-5 to +5) from the pre-generated pool.
+
+        Returns:
+            Random score adjustment
+        """
+        # Work on local copies so a concurrent refill cannot push the index out of range
+        pool = cls._jitter_pool
+        index = cls._jitter_index
+        if index >= len(pool):
+            pool = cls._jitter_pool = array("b", random.choices(range(-5, 6), k=cls.JITTER_POOL_SIZE))
+            index = 0
+        cls._jitter_index = index + 1
+        return pool[index]
+
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
+    def _deterministic_score(cls, income_bucket: int, loan_type: str) -> int:
+        """
+        Calculate the base score with income and loan type adjustments (no random variation).
+
+        Args:
+            income_bucket: 0 for low income (<30000), 1 for normal, 2 for high income (>75000)
+            loan_type: Type of loan (PERSONAL, HOME, AUTO, BUSINESS), upper-case
+
+        Returns:
+            Score before random variation and clamping
+        """
+        income_adjustment = cls.INCOME_ADJUSTMENTS[income_bucket]
+        loan_type_adjustment = cls.LOAN_TYPE_ADJUSTMENTS.get(loan_type, 0)
+
+        logger.debug("Income adjustment: %+d points, loan type adjustment: %+d points", income_adjustment, loan_type_adjustment)
+
+        return cls.BASE_SCORE + income_adjustment + loan_type_adjustment
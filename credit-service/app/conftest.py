@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -19,9 +19,10 @@ def client():
     """Create a test client for the FastAPI app."""
     import main
 
-    # Use TestClient without triggering lifespan events
-    with TestClient(main.app, raise_server_exceptions=False) as test_client:
-        yield test_client
+    # Run the lifespan without starting the real Kafka consumer task
+    with patch("main.start_kafka_consumer", new=AsyncMock()):
+        with TestClient(main.app, raise_server_exceptions=False) as test_client:
+            yield test_client
 
 
 @pytest.fixture
@@ -29,7 +30,7 @@ def sample_loan_application():
     """Sample loan application message for testing."""
     return {
         "application_id": "123e4567-e89b-12d3-a456-426614174000",
-        "pan_number": "ABCDE1234F",
+        "pan_number": "XYZAB9012C",
         "applicant_name": "John Doe",
         "monthly_income": 50000.0,
         "loan_amount": 500000.0,
@@ -1,17 +1,30 @@
-import json
+import asyncio
 import logging
 import os
+from datetime import datetime, timezone
+from functools import partial
 from typing import Callable, Optional
 
-from kafka import KafkaConsumer, KafkaProducer
+import orjson
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for delivering buffered records when shutting down
+PRODUCER_FLUSH_TIMEOUT_SECONDS = 30
+
+
+def _setting(value: Optional[int], env_var: str, default: str) -> int:
+    """Return value if given (0 included), otherwise the integer from env_var or default."""
+    return value if value is not None else int(os.getenv(env_var, default))
+
 
 class CreditKafkaHandler:
     """
     Kafka handler for Credit Service.
     Consumes from loan_applications_submitted topic and produces to credit-checks topic.
+
+    Runs on the application's asyncio event loop using aiokafka.
     """
 
     def __init__(
@@ -20,55 +33,77 @@ class CreditKafkaHandler:
         consumer_group: str = "credit-service-group",
         consume_topic: str = "loan_applications_submitted",
         produce_topic: str = "credit-checks",
+        fetch_min_bytes: Optional[int] = None,
+        fetch_max_wait_ms: Optional[int] = None,
+        max_poll_records: Optional[int] = None,
+        max_poll_interval_ms: Optional[int] = None,
     ):
         self.bootstrap_servers = bootstrap_servers or os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
         self.consumer_group = consumer_group
         self.consume_topic = consume_topic
         self.produce_topic = produce_topic
-        self.consumer: Optional[KafkaConsumer] = None
-        self.producer: Optional[KafkaProducer] = None
-
-    def connect(self):
+        # Consumer fetch sizing: wait for larger fetches instead of many tiny ones
+        self.fetch_min_bytes = _setting(fetch_min_bytes, "KAFKA_FETCH_MIN_BYTES", "65536")
+        self.fetch_max_wait_ms = _setting(fetch_max_wait_ms, "KAFKA_FETCH_MAX_WAIT_MS", "200")
+        self.max_poll_records = _setting(max_poll_records, "KAFKA_MAX_POLL_RECORDS", "500")
+        self.max_poll_interval_ms = _setting(max_poll_interval_ms, "KAFKA_MAX_POLL_INTERVAL_MS", "300000")
+        self.consumer: Optional[AIOKafkaConsumer] = None
+        self.producer: Optional[AIOKafkaProducer] = None
+
+    async def connect(self):
         """
-        Connect to Kafka broker and initialize consumer and producer.
+        Connect to Kafka broker and start consumer and producer.
         """
         try:
             # Initialize consumer
-            self.consumer = KafkaConsumer(
+            self.consumer = AIOKafkaConsumer(
                 self.consume_topic,
                 bootstrap_servers=self.bootstrap_servers,
                 group_id=self.consumer_group,
-                value_deserializer=lambda m: json.loads(m.decode("utf-8")),
+                value_deserializer=orjson.loads,
                 key_deserializer=lambda k: k.decode("utf-8") if k else None,
                 auto_offset_reset="earliest",
                 enable_auto_commit=True,
-                max_poll_interval_ms=300000,
+                fetch_min_bytes=self.fetch_min_bytes,
+                fetch_max_wait_ms=self.fetch_max_wait_ms,
+                max_poll_records=self.max_poll_records,
+                max_poll_interval_ms=self.max_poll_interval_ms,
             )
 
             # Initialize producer
-            self.producer = KafkaProducer(
+            self.producer = AIOKafkaProducer(
                 bootstrap_servers=self.bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+                value_serializer=orjson.dumps,
                 key_serializer=lambda k: k.encode("utf-8") if k else None,
                 acks="all",
-                retries=3,
+                linger_ms=10,
+                max_batch_size=65536,
+                compression_type="lz4",
             )
 
-            logger.info(f"Connected to Kafka at {self.bootstrap_servers}")
-            logger.info(f"Consuming from topic: {self.consume_topic}")
-            logger.info(f"Producing to topic: {self.produce_topic}")
-            logger.info(f"Consumer group: {self.consumer_group}")
+            await self.consumer.start()
+            await self.producer.start()
+
+            logger.info("Connected to Kafka at %s", self.bootstrap_servers)
+            logger.info("Consuming from topic: %s", self.consume_topic)
+            logger.info("Producing to topic: %s", self.produce_topic)
+            logger.info("Consumer group: %s", self.consumer_group)
 
         except Exception as e:
-            logger.error(f"Failed to connect to Kafka: {e}")
+            logger.error("Failed to connect to Kafka: %s", e)
             raise
 
-    def consume_and_process(self, message_handler: Callable[[dict], dict]):
+    async def consume_and_process(self, message_handler: Callable[[dict, str], dict]):
         """
-        Consume messages from Kafka and process them with the provided handler.
+        Consume messages from Kafka in batches and process them with the provided handler.
+
+        Records of each partition are processed in order. Results are sent without
+        waiting for the broker and the producer is flushed once per batch. The loop
+        runs until the surrounding task is cancelled.
 
         Args:
-            message_handler: Function to process each message and return result
+            message_handler: Function to process each message and return result, with signature:
+                            message_handler(message: dict, completed_at: str) -> dict
         """
         if not self.consumer or not self.producer:
             raise RuntimeError("Kafka consumer/producer not connected. Call connect() first.")
@@ -76,33 +111,63 @@ class CreditKafkaHandler:
         logger.info("Starting to consume messages from Kafka...")
 
         try:
-            for message in self.consumer:
-                try:
-                    logger.info(
-                        f"Received message from topic {message.topic}, partition {message.partition}, offset {message.offset}"
-                    )
-                    logger.debug(f"Message key: {message.key}, value: {message.value}")
+            while True:
+                batch = await self.consumer.getmany(timeout_ms=500, max_records=self.max_poll_records)
+                if not batch:
+                    continue
 
-                    # Process the message using the handler
-                    result = message_handler(message.value)
+                # One completion timestamp for the whole batch
+                completed_at = datetime.now(timezone.utc).isoformat()
 
-                    # Publish result to output topic if handler returned something
-                    if result:
-                        self._publish_result(result)
+                for records in batch.values():
+                    await self._process_records(records, message_handler, completed_at)
 
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}", exc_info=True)
-                    # Continue processing other messages
+                # Wait for the whole batch to be delivered
+                await self.producer.flush()
 
-        except KeyboardInterrupt:
-            logger.info("Consumer interrupted by user")
+        except asyncio.CancelledError:
+            logger.info("Consumer loop cancelled")
+            raise
         except Exception as e:
-            logger.error(f"Error in consumer loop: {e}", exc_info=True)
+            logger.error("Error in consumer loop: %s", e, exc_info=True)
             raise
 
-    def _publish_result(self, result: dict):
+    async def _process_records(self, records: list, message_handler: Callable[[dict, str], dict], completed_at: str):
+        """
+        Process the records of a single partition in order and publish the results.
+
+        Args:
+            records: Consumer records of one topic partition
+            message_handler: Function to process each message and return result
+            completed_at: ISO timestamp shared by the batch
         """
-        Publish result to the output Kafka topic.
+        for message in records:
+            try:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Received message from topic %s, partition %s, offset %s",
+                        message.topic,
+                        message.partition,
+                        message.offset,
+                    )
+                logger.debug("Message key: %s, value: %s", message.key, message.value)
+
+                # Process the message using the handler
+                result = message_handler(message.value, completed_at)
+
+                # Publish result to output topic if handler returned something
+                if result:
+                    await self._publish_result(result)
+
+            except Exception as e:
+                logger.error("Error processing message: %s", e, exc_info=True)
+                # Continue processing other messages
+
+    async def _publish_result(self, result: dict):
+        """
+        Publish result to the output Kafka topic without waiting for the broker.
+
+        Delivery is reported through a callback; the caller is responsible for flushing.
 
         Args:
             result: Dictionary to publish
@@ -110,31 +175,46 @@ class CreditKafkaHandler:
         try:
             application_id = result.get("application_id")
 
-            future = self.producer.send(self.produce_topic, key=application_id, value=result)
-
-            # Wait for the message to be sent
-            record_metadata = future.get(timeout=10)
-
-            logger.info(
-                f"Published credit report for application {application_id} "
-                f"to topic {self.produce_topic}, "
-                f"partition {record_metadata.partition}, "
-                f"offset {record_metadata.offset}"
-            )
+            future = await self.producer.send(self.produce_topic, key=application_id, value=result)
+            future.add_done_callback(partial(self._on_send_done, application_id))
 
         except Exception as e:
-            logger.error(f"Failed to publish result to Kafka: {e}", exc_info=True)
+            logger.error("Failed to publish result to Kafka: %s", e, exc_info=True)
             raise
 
-    def close(self):
+    def _on_send_done(self, application_id: str, future: asyncio.Future):
+        if future.cancelled():
+            logger.error("Publishing credit report for application %s was cancelled", application_id)
+            return
+
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Failed to publish credit report for application %s: %s", application_id, exc)
+            return
+
+        record_metadata = future.result()
+        logger.info(
+            "Published credit report for application %s to topic %s, partition %s, offset %s",
+            application_id,
+            record_metadata.topic,
+            record_metadata.partition,
+            record_metadata.offset,
+        )
+
+    async def close(self):
         """
-        Close Kafka consumer and producer connections.
+        Stop Kafka consumer and producer, delivering buffered records first.
         """
         if self.consumer:
-            self.consumer.close()
+            await self.consumer.stop()
             logger.info("Kafka consumer closed")
 
         if self.producer:
-            self.producer.flush()
-            self.producer.close()
+            try:
+                # Deliver everything still buffered before tearing the producer down
+                await asyncio.wait_for(self.producer.flush(), timeout=PRODUCER_FLUSH_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out flushing Kafka producer after %s seconds", PRODUCER_FLUSH_TIMEOUT_SECONDS)
+            finally:
+                await self.producer.stop()
             logger.info("Kafka producer closed")
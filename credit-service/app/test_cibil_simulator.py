@@ -29,7 +29,7 @@ class TestCIBILSimulator:
         score3 = CIBILSimulator.calculate_cibil_score(pan_number="FGHIJ5678K", monthly_income=100000, loan_type="HOME")
         assert score3 == 610
 
-    @patch("cibil_simulator.random.randint")
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
     def test_base_score_calculation(self, mock_random):
         """Test base score calculation for non-test PAN."""
         mock_random.return_value = 0  # No random adjustment
@@ -42,7 +42,7 @@ class TestCIBILSimulator:
         # Base score is 650, no adjustments
         assert score == 650
 
-    @patch("cibil_simulator.random.randint")
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
     def test_high_income_bonus(self, mock_random):
         """Test that high income (>75000) adds 40 points."""
         mock_random.return_value = 0  # No random adjustment
@@ -55,7 +55,7 @@ class TestCIBILSimulator:
         # Base 650 + 40 (high income) = 690
         assert score == 690
 
-    @patch("cibil_simulator.random.randint")
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
     def test_low_income_penalty(self, mock_random):
         """Test that low income (<30000) subtracts 20 points."""
         mock_random.return_value = 0  # No random adjustment
@@ -68,7 +68,7 @@ class TestCIBILSimulator:
         # Base 650 - 20 (low income) = 630
         assert score == 630
 
-    @patch("cibil_simulator.random.randint")
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
     def test_personal_loan_penalty(self, mock_random):
         """Test that personal loan (unsecured) subtracts 10 points."""
         mock_random.return_value = 0  # No random adjustment
@@ -77,7 +77,7 @@ class TestCIBILSimulator:
         # Base 650 - 10 (personal loan) = 640
         assert score == 640
 
-    @patch("cibil_simulator.random.randint")
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
     def test_home_loan_bonus(self, mock_random):
         """Test that home loan (secured) adds 10 points."""
         mock_random.return_value = 0  # No random adjustment
@@ -86,7 +86,7 @@ class TestCIBILSimulator:
         # Base 650 + 10 (home loan) = 660
         assert score == 660
 
-    @patch("cibil_simulator.random.randint")
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
     def test_combined_high_income_and_home_loan(self, mock_random):
         """Test combined effect of high income and home loan."""
         mock_random.return_value = 0
@@ -99,7 +99,7 @@ class TestCIBILSimulator:
         # Base 650 + 40 (income) + 10 (home) = 700
         assert score == 700
 
-    @patch("cibil_simulator.random.randint")
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
     def test_score_within_valid_range(self, mock_random):
         """Test that calculated score is always within 300-900 range."""
         mock_random.return_value = 0
@@ -116,3 +116,23 @@ class TestCIBILSimulator:
         for income, loan_type in test_cases:
             score = CIBILSimulator.calculate_cibil_score(pan_number="XYZAB9012C", monthly_income=income, loan_type=loan_type)
             assert CIBILSimulator.MIN_SCORE <= score <= CIBILSimulator.MAX_SCORE
+
+    @patch("cibil_simulator.CIBILSimulator._next_jitter")
+    def test_deterministic_part_is_cached(self, mock_random):
+        """Test that repeated (income bucket, loan type) inputs reuse the cached base score."""
+        mock_random.return_value = 0
+        CIBILSimulator._deterministic_score.cache_clear()
+
+        first = CIBILSimulator.calculate_cibil_score(pan_number="XYZAB9012C", monthly_income=80000, loan_type="HOME")
+        second = CIBILSimulator.calculate_cibil_score(pan_number="PQRST9012D", monthly_income=90000, loan_type="home")
+
+        assert first == second == 700
+        cache_info = CIBILSimulator._deterministic_score.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+    def test_jitter_within_range(self):
+        """Test that random adjustments stay within -5 to +5 across a pool refill."""
+        jitters = [CIBILSimulator._next_jitter() for _ in range(CIBILSimulator.JITTER_POOL_SIZE + 10)]
+
+        assert all(-5 <= jitter <= 5 for jitter in jitters)
@@ -1,12 +1,13 @@
 from unittest.mock import patch
 
+from kafka_handler import CreditKafkaHandler
 from main import process_loan_application
 
 
 class TestProcessLoanApplication:
     """Test cases for the process_loan_application function."""
 
-    @patch("main.CIBILSimulator.calculate_cibil_score")
+    @patch("main._calculate_cibil_score")
     def test_process_loan_application_success(self, mock_calculate, sample_loan_application):
         """Test successful loan application processing."""
         mock_calculate.return_value = 750
@@ -30,18 +31,19 @@ class TestProcessLoanApplication:
         assert result["cibil_score"] == 750
         assert "credit_check_completed_at" in result
 
-    @patch("main.CIBILSimulator.calculate_cibil_score")
+    @patch("main._calculate_cibil_score")
     def test_process_loan_application_with_test_pan(self, mock_calculate, sample_loan_application):
-        """Test processing with predefined test PAN."""
-        mock_calculate.return_value = 790
+        """Test that predefined test PANs are answered without running the score calculation."""
         sample_loan_application["pan_number"] = "ABCDE1234F"
 
-        result = process_loan_application(sample_loan_application)
+        result = process_loan_application(sample_loan_application, "2024-01-01T00:00:00+00:00")
 
         assert result["cibil_score"] == 790
         assert result["pan_number"] == "ABCDE1234F"
+        assert result["credit_check_completed_at"] == "2024-01-01T00:00:00+00:00"
+        mock_calculate.assert_not_called()
 
-    @patch("main.CIBILSimulator.calculate_cibil_score")
+    @patch("main._calculate_cibil_score")
     def test_process_loan_application_forwards_all_fields(self, mock_calculate, sample_loan_application):
         """Test that all fields from original message are forwarded."""
         mock_calculate.return_value = 700
@@ -61,7 +63,7 @@ class TestProcessLoanApplication:
         assert result["cibil_score"] == 700
         assert "credit_check_completed_at" in result
 
-    @patch("main.CIBILSimulator.calculate_cibil_score")
+    @patch("main._calculate_cibil_score")
     def test_process_loan_application_error_handling(self, mock_calculate, sample_loan_application):
         """Test error handling when CIBIL calculation fails."""
         mock_calculate.side_effect = Exception("CIBIL service unavailable")
@@ -78,7 +80,7 @@ class TestProcessLoanApplication:
         assert result["application_id"] == sample_loan_application["application_id"]
         assert result["pan_number"] == sample_loan_application["pan_number"]
 
-    @patch("main.CIBILSimulator.calculate_cibil_score")
+    @patch("main._calculate_cibil_score")
     def test_process_loan_application_various_loan_types(self, mock_calculate, sample_loan_application):
         """Test processing applications with different loan types."""
         loan_types_and_scores = [
@@ -96,3 +98,42 @@ class TestProcessLoanApplication:
 
             assert result["loan_type"] == loan_type
             assert result["cibil_score"] == expected_score
+
+    @patch("main._calculate_cibil_score")
+    def test_process_loan_application_uses_batch_timestamp(self, mock_calculate, sample_loan_application):
+        """Test that a timestamp passed in for the batch is used as credit_check_completed_at."""
+        mock_calculate.return_value = 700
+        completed_at = "2024-01-01T00:00:00+00:00"
+
+        result = process_loan_application(sample_loan_application, completed_at)
+
+        assert result["credit_check_completed_at"] == completed_at
+
+
+class TestHealthCheck:
+    """Test cases for the health check endpoint."""
+
+    def test_health_check_reports_kafka_state(self, client):
+        """Test that /health reflects the shared connection state."""
+        import main
+
+        with patch.dict(main._HEALTH, {"kafka_connected": True}):
+            response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy", "service": "credit-service", "kafka_connected": True}
+
+
+class TestCreditKafkaHandler:
+    """Test cases for the credit service Kafka handler settings."""
+
+    def test_explicit_zero_settings_are_kept(self, monkeypatch):
+        """Test that 0 passed to the constructor is not replaced by the environment or default."""
+        monkeypatch.setenv("KAFKA_FETCH_MAX_WAIT_MS", "200")
+        monkeypatch.delenv("KAFKA_MAX_POLL_RECORDS", raising=False)
+
+        handler = CreditKafkaHandler(fetch_min_bytes=0, fetch_max_wait_ms=0)
+
+        assert handler.fetch_min_bytes == 0
+        assert handler.fetch_max_wait_ms == 0
+        assert handler.max_poll_records == 500
@@ -1,5 +1,14 @@
 from . import crud
-from .database import Base, SessionLocal, engine, get_db, init_db
+from .database import Base, get_db, get_engine, get_sessionmaker, init_db
 from .models import Application
 
-__all__ = ["engine", "SessionLocal", "Base", "get_db", "init_db", "Application", "crud"]
+__all__ = ["engine", "SessionLocal", "Base", "get_db", "get_engine", "get_sessionmaker", "init_db", "Application", "crud"]
+
+
+def __getattr__(name: str):
+    # ``engine`` and ``SessionLocal`` are created on first access, see database.database
+    if name in ("engine", "SessionLocal"):
+        from . import database
+
+        return getattr(database, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,76 @@
+import threading
+from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
 from uuid import UUID
 
+from cachetools import TTLCache, cached
+from sqlalchemy import bindparam, func, insert, literal, select, tuple_, update
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from .models import Application
 
+# Statistics are polled frequently but change slowly; serve them from memory for a few
+# seconds and drop the cached value whenever this process writes an application.
+STATISTICS_CACHE_TTL_SECONDS = 5
+_statistics_cache = TTLCache(maxsize=1, ttl=STATISTICS_CACHE_TTL_SECONDS)
+_statistics_cache_lock = threading.Lock()
+
+# Status lookups are polled repeatedly by clients waiting on a decision. Decided statuses are
+# served from memory for a couple of seconds; PENDING is never cached, because the decision
+# service replaces it from another process and this cache is only invalidated locally.
+STATUS_CACHE_TTL_SECONDS = 2
+_UNCACHED_STATUSES = frozenset({"PENDING"})
+_status_cache = TTLCache(maxsize=10000, ttl=STATUS_CACHE_TTL_SECONDS)
+_status_cache_lock = threading.Lock()
+
+# Keyset pagination cursor: (created_at, id) of the last row on the previous page
+Cursor = Tuple[datetime, UUID]
+
+
+def _paginate(query, limit: int, after: Optional[Cursor]) -> Tuple[List[Application], Optional[Cursor]]:
+    """Apply newest-first keyset pagination and return the page with the cursor for the next one."""
+    if after is not None:
+        created_at, application_id = after
+        query = query.filter(
+            tuple_(Application.created_at, Application.id)
+            < tuple_(literal(created_at, Application.created_at.type), literal(application_id, Application.id.type))
+        )
+    rows = query.order_by(Application.created_at.desc(), Application.id.desc()).limit(limit).all()
+    next_cursor = (rows[-1].created_at, rows[-1].id) if len(rows) == limit else None
+    return rows, next_cursor
+
+
+def _as_uuid(value: Union[str, UUID]) -> UUID:
+    """Return value as a UUID, parsing it only when given a string."""
+    return value if isinstance(value, UUID) else UUID(value)
+
+
+@lru_cache(maxsize=None)
+def _update_status_stmt():
+    """
+    UPDATE of status and CIBIL score by id, with every value bound.
+
+    Built once on first use (after the mapped column types are final) and reused, so the
+    hot update path neither rebuilds the statement nor misses the compiled-SQL cache.
+    A NULL score keeps the stored one.
+    """
+    cibil_score = bindparam("b_cibil_score", type_=Application.cibil_score.type)
+    return (
+        update(Application)
+        .where(Application.id == bindparam("b_id"))
+        .values(status=bindparam("b_status"), cibil_score=func.coalesce(cibil_score, Application.cibil_score))
+    )
+
+
+@lru_cache(maxsize=None)
+def _update_status_returning_stmt():
+    """Same as _update_status_stmt, returning the id of the updated row."""
+    return _update_status_stmt().returning(Application.id)
+
 
 class ApplicationCRUD:
     """
@@ -23,10 +87,12 @@ class ApplicationCRUD:
         loan_type: str,
         status: str = "PENDING",
         cibil_score: Optional[int] = None,
-    ) -> Application:
+    ) -> Row:
         """
         Create a new application record.
 
+        Issues a single INSERT ... RETURNING instead of inserting and then reloading the row.
+
         Args:
             db: Database session
             pan_number: Applicant's PAN number
@@ -38,29 +104,64 @@ class ApplicationCRUD:
             cibil_score: CIBIL score (optional)
 
         Returns:
-            Application: Created application instance
+            Row: Stored column values of the created application, by column name
 
         Raises:
             IntegrityError: If duplicate entry or constraint violation
         """
         try:
-            application = Application(
-                pan_number=pan_number,
-                applicant_name=applicant_name,
-                monthly_income_inr=monthly_income_inr,
-                loan_amount_inr=loan_amount_inr,
-                loan_type=loan_type,
-                status=status,
-                cibil_score=cibil_score,
+            stmt = (
+                insert(Application)
+                .values(
+                    pan_number=pan_number,
+                    applicant_name=applicant_name,
+                    monthly_income_inr=monthly_income_inr,
+                    loan_amount_inr=loan_amount_inr,
+                    loan_type=loan_type,
+                    status=status,
+                    cibil_score=cibil_score,
+                )
+                .returning(*Application.__table__.c)
             )
-            db.add(application)
+            application = db.execute(stmt).one()
             db.commit()
-            db.refresh(application)
+            ApplicationCRUD.invalidate_statistics()
             return application
         except IntegrityError as e:
             db.rollback()
             raise e
 
+    @staticmethod
+    def bulk_create_applications(db: Session, rows: List[dict]) -> List[Tuple[UUID, datetime]]:
+        """
+        Create multiple application records with a single INSERT and commit.
+
+        Unlike create_application, only the generated id and created_at of each row
+        are returned; use create_application when all stored values are needed.
+
+        Args:
+            db: Database session
+            rows: Column values for each application, keyed by Application attribute name
+
+        Returns:
+            (id, created_at) of each created application, in the order of rows
+
+        Raises:
+            IntegrityError: If duplicate entry or constraint violation
+        """
+        if not rows:
+            return []
+
+        try:
+            stmt = insert(Application).returning(Application.id, Application.created_at, sort_by_parameter_order=True)
+            created = [tuple(row) for row in db.execute(stmt, rows)]
+            db.commit()
+            ApplicationCRUD.invalidate_statistics()
+            return created
+        except IntegrityError as e:
+            db.rollback()
+            raise e
+
     @staticmethod
     def get_application_by_id(db: Session, application_id: UUID) -> Optional[Application]:
         """
@@ -76,70 +177,134 @@ class ApplicationCRUD:
         return db.query(Application).filter(Application.id == application_id).first()
 
     @staticmethod
-    def get_applications_by_status(db: Session, status: str, limit: int = 100, offset: int = 0) -> List[Application]:
+    def get_application_status(db: Session, application_id: UUID) -> Optional[str]:
         """
-        Get applications by status with pagination.
+        Get only the status of an application.
+
+        Selects the single column instead of loading an Application instance. Decided
+        (non-PENDING) statuses are cached for STATUS_CACHE_TTL_SECONDS, so a change made by
+        another process to an already decided application can take that long to show.
+
+        Args:
+            db: Database session
+            application_id: UUID of the application
+
+        Returns:
+            Status if the application exists, None otherwise
+        """
+        with _status_cache_lock:
+            cached_status = _status_cache.get(application_id)
+        if cached_status is not None:
+            return cached_status
+
+        application_status = db.execute(select(Application.status).where(Application.id == application_id)).scalar_one_or_none()
+        if application_status is not None and application_status not in _UNCACHED_STATUSES:
+            with _status_cache_lock:
+                _status_cache[application_id] = application_status
+        return application_status
+
+    @staticmethod
+    def get_applications_by_status(
+        db: Session, status: str, limit: int = 100, after: Optional[Cursor] = None, summary_only: bool = False
+    ) -> Tuple[List[Application], Optional[Cursor]]:
+        """
+        Get applications by status with keyset pagination, newest first.
 
         Args:
             db: Database session
             status: Application status
             limit: Maximum number of results
-            offset: Number of results to skip
+            after: Cursor returned by the previous page, None for the first page
+            summary_only: Load only id, PAN, status, CIBIL score and created_at;
+                other attributes are fetched lazily on access
 
         Returns:
-            List of Application instances
-        """
-        return (
-            db.query(Application)
-            .filter(Application.status == status)
-            .order_by(Application.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
+            Tuple of (Application instances, cursor for the next page or None)
+        """
+        query = db.query(Application)
+        if summary_only:
+            query = query.options(
+                load_only(
+                    Application.id,
+                    Application.pan_number,
+                    Application.status,
+                    Application.cibil_score,
+                    Application.created_at,
+                )
+            )
+        return _paginate(query.filter(Application.status == status), limit, after)
 
     @staticmethod
-    def get_all_applications(db: Session, limit: int = 100, offset: int = 0) -> List[Application]:
+    def get_all_applications(
+        db: Session, limit: int = 100, after: Optional[Cursor] = None
+    ) -> Tuple[List[Application], Optional[Cursor]]:
         """
-        Get all applications with pagination.
+        Get all applications with keyset pagination, newest first.
 
         Args:
             db: Database session
             limit: Maximum number of results
-            offset: Number of results to skip
+            after: Cursor returned by the previous page, None for the first page
 
         Returns:
-            List of Application instances
+            Tuple of (Application instances, cursor for the next page or None)
         """
-        return db.query(Application).order_by(Application.created_at.desc()).limit(limit).offset(offset).all()
+        return _paginate(db.query(Application), limit, after)
 
     @staticmethod
     def update_application_status(
         db: Session,
-        application_id: UUID,
+        application_id: Union[str, UUID],
         status: str,
         cibil_score: Optional[int] = None,
-    ) -> Optional[Application]:
+    ) -> Optional[UUID]:
         """
         Update application status and optionally CIBIL score.
 
+        Issues a single UPDATE ... RETURNING instead of loading the row first.
+
         Args:
             db: Database session
-            application_id: UUID of the application
+            application_id: UUID of the application, as a UUID or its string form
             status: New status
             cibil_score: CIBIL score (optional)
 
         Returns:
-            Updated Application if found, None otherwise
+            ID of the updated application if found, None otherwise
         """
-        application = db.query(Application).filter(Application.id == application_id).first()
-        if application:
-            application.status = status
-            if cibil_score is not None:
-                application.cibil_score = cibil_score
-            db.commit()
-            db.refresh(application)
-        return application
+        params = {"b_id": _as_uuid(application_id), "b_status": status, "b_cibil_score": cibil_score}
+        updated_id = db.connection().execute(_update_status_returning_stmt(), params).scalar_one_or_none()
+        db.commit()
+        if updated_id is not None:
+            ApplicationCRUD.invalidate_statistics()
+            ApplicationCRUD.invalidate_statuses([updated_id])
+        return updated_id
+
+    @staticmethod
+    def bulk_update_application_status(db: Session, updates: List[dict]) -> Optional[int]:
+        """
+        Update the status and CIBIL score of many applications with one executemany UPDATE.
+
+        Args:
+            db: Database session
+            updates: Dicts with application_id (UUID or str), status and cibil_score;
+                a None cibil_score leaves the stored score unchanged
+
+        Returns:
+            Number of applications updated, or None when the driver cannot report it
+            (psycopg2 batched executemany)
+        """
+        params = [
+            {"b_id": _as_uuid(item["application_id"]), "b_status": item["status"], "b_cibil_score": item.get("cibil_score")}
+            for item in updates
+        ]
+        # Core executemany on the session's connection; the ORM bulk path would reject
+        # unknown ids instead of skipping them
+        result = db.connection().execute(_update_status_stmt(), params)
+        db.commit()
+        ApplicationCRUD.invalidate_statistics()
+        ApplicationCRUD.invalidate_statuses(param["b_id"] for param in params)
+        return result.rowcount if db.get_bind().dialect.supports_sane_multi_rowcount else None
 
     @staticmethod
     def count_applications_by_status(db: Session, status: str) -> int:
@@ -156,26 +321,44 @@ class ApplicationCRUD:
         return db.query(Application).filter(Application.status == status).count()
 
     @staticmethod
+    @cached(_statistics_cache, key=lambda db: "statistics", lock=_statistics_cache_lock)
     def get_statistics(db: Session) -> dict:
         """
         Get statistics about applications.
 
+        Results are cached for STATISTICS_CACHE_TTL_SECONDS; writes made through
+        ApplicationCRUD in this process invalidate the cache.
+
         Args:
             db: Database session
 
         Returns:
             Dictionary with statistics
         """
-        total = db.query(Application).count()
-        pending = ApplicationCRUD.count_applications_by_status(db, "PENDING")
-        pre_approved = ApplicationCRUD.count_applications_by_status(db, "PRE_APPROVED")
-        rejected = ApplicationCRUD.count_applications_by_status(db, "REJECTED")
-        manual_review = ApplicationCRUD.count_applications_by_status(db, "MANUAL_REVIEW")
+        # Single GROUP BY query instead of one COUNT per status
+        counts = dict(db.query(Application.status, func.count()).group_by(Application.status).all())
 
         return {
-            "total": total,
-            "pending": pending,
-            "pre_approved": pre_approved,
-            "rejected": rejected,
-            "manual_review": manual_review,
+            "total": sum(counts.values()),
+            "pending": counts.get("PENDING", 0),
+            "pre_approved": counts.get("PRE_APPROVED", 0),
+            "rejected": counts.get("REJECTED", 0),
+            "manual_review": counts.get("MANUAL_REVIEW", 0),
         }
+
+    @staticmethod
+    def invalidate_statistics() -> None:
+        """
+        Drop the cached statistics so the next get_statistics call queries the database.
+        """
+        with _statistics_cache_lock:
+            _statistics_cache.clear()
+
+    @staticmethod
+    def invalidate_statuses(application_ids: Iterable[UUID]) -> None:
+        """
+        Drop the cached statuses of the given applications.
+        """
+        with _status_cache_lock:
+            for application_id in application_ids:
+                _status_cache.pop(application_id, None)
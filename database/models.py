@@ -1,9 +1,24 @@
+import os
+import time
 import uuid
 
-from sqlalchemy import DECIMAL, TIMESTAMP, Column, Integer, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DECIMAL, Column, Index, Integer, String, func
 
 from .database import Base
+from .types import GUID, Timestamp
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits are the Unix timestamp in milliseconds, so new ids land at
+    the right-hand edge of the primary key B-tree instead of at random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
 
 
 class Application(Base):
@@ -17,17 +32,15 @@ class Application(Base):
 
     # Primary key
     id = Column(
-        UUID(as_uuid=True),
+        GUID(),
         primary_key=True,
-        default=uuid.uuid4,
-        unique=True,
+        default=uuid7,
         nullable=False,
         comment="Unique identifier for the application",
-        index=True,
     )
 
     # Applicant information
-    pan_number = Column(String(10), nullable=False, comment="Applicant's PAN number")
+    pan_number = Column(String(10), nullable=False, index=True, comment="Applicant's PAN number")
 
     applicant_name = Column(String(255), nullable=True, comment="Applicant's full name")
 
@@ -60,14 +73,14 @@ class Application(Base):
 
     # Timestamps
     created_at = Column(
-        TIMESTAMP(timezone=True),
+        Timestamp(),
         nullable=False,
         server_default=func.now(),
         comment="Timestamp when the application was created",
     )
 
     updated_at = Column(
-        TIMESTAMP(timezone=True),
+        Timestamp(),
         nullable=False,
         server_default=func.now(),
         onupdate=func.now(),
@@ -97,3 +110,12 @@ class Application(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+# Serves status filters and the newest-first (created_at, id) keyset listing from one
+# index; its leading column also covers plain status lookups and counts.
+_columns = Application.__table__.c
+Index("ix_applications_status_created_at", _columns.status, _columns.created_at.desc(), _columns.id.desc())
+
+# Newest-first (created_at, id) keyset listing across all statuses (get_all_applications)
+Index("ix_applications_created_at", _columns.created_at.desc(), _columns.id.desc())
@@ -0,0 +1,61 @@
+import uuid
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import CHAR, TIMESTAMP, TypeDecorator
+
+
+class GUID(TypeDecorator):
+    """Platform-independent GUID type.
+    Uses PostgreSQL's UUID type, otherwise uses CHAR(36), storing as stringified hex values.
+    """
+
+    impl = CHAR
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(UUID())
+        else:
+            return dialect.type_descriptor(CHAR(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return value
+        elif dialect.name == "postgresql":
+            return str(value)
+        else:
+            if not isinstance(value, uuid.UUID):
+                return str(uuid.UUID(value))
+            else:
+                return str(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return value
+        else:
+            if not isinstance(value, uuid.UUID):
+                return uuid.UUID(value)
+            else:
+                return value
+
+
+class Timestamp(TypeDecorator):
+    """Timezone-aware timestamp type.
+    On SQLite, which stores CURRENT_TIMESTAMP defaults as text without fractional seconds,
+    bound datetimes are written in that same format so stored and bound values compare correctly.
+    """
+
+    impl = TIMESTAMP
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(timezone=True)
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(
+                sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d")
+            )
+        else:
+            return dialect.type_descriptor(TIMESTAMP(timezone=True))
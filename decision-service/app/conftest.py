@@ -1,15 +1,16 @@
 import os
 import sys
-import uuid
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import Mock, patch
 
+import msgspec
 import pytest
+from credit_report import CreditReport
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
-from sqlalchemy.types import CHAR, TypeDecorator
 
 from database import Base
 
@@ -18,134 +19,136 @@ root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 sys.path.insert(0, root_dir)
 
 
-class GUID(TypeDecorator):
-    """Platform-independent GUID type.
-    Uses PostgreSQL's UUID type, otherwise uses CHAR(36), storing as stringified hex values.
+def _all_found(db_session, updates) -> int:
     """
+    Shared stand-in result for the bulk status update: every application was found.
 
-    impl = CHAR
-    cache_ok = True
-
-    def load_dialect_impl(self, dialect):
-        if dialect.name == "postgresql":
-            return dialect.type_descriptor(UUID())
-        else:
-            return dialect.type_descriptor(CHAR(36))
-
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return value
-        elif dialect.name == "postgresql":
-            return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            else:
-                return str(value)
-
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
-            else:
-                return value
+    The bulk update returns a row count rather than a row, so one module-level function
+    replaces the former shared result Mock instead of building a result per test.
+    """
+    return len(updates)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def db_engine():
-    """Create an in-memory SQLite database engine for testing."""
+    """Create an in-memory SQLite database engine shared by the whole test session."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
 
-    # Replace UUID type with GUID for SQLite compatibility
-    for table in Base.metadata.tables.values():
-        for column in table.columns:
-            if hasattr(column.type, "__class__") and column.type.__class__.__name__ == "UUID":
-                column.type = GUID()
+    # Let SQLAlchemy drive transactions so SAVEPOINTs work with pysqlite
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
 
 
 @pytest.fixture(scope="function")
 def db_session(db_engine):
-    """Create a new database session for a test."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-    session = TestingSessionLocal()
+    """
+    Create a database session for a test, rolled back when the test finishes.
+
+    The session joins an outer transaction and turns its own commits into SAVEPOINTs.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     yield session
     session.close()
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope="function")
 def mock_kafka_handler():
     """Mock Kafka handler for testing."""
     with patch("main.kafka_handler") as mock_handler:
-        mock_handler.connect = MagicMock()
-        mock_handler.consume_and_process = MagicMock()
-        mock_handler.close = MagicMock()
+        mock_handler.connect = Mock()
+        mock_handler.consume_and_process = Mock()
+        mock_handler.close = Mock()
         yield mock_handler
 
 
+@pytest.fixture(scope="function")
+def decision_mocks(monkeypatch):
+    """Replace the bulk status update used by process_credit_reports; decisions come from the real engine."""
+    bulk_update = Mock(side_effect=_all_found)
+    monkeypatch.setattr("main.ApplicationCRUD.bulk_update_application_status", bulk_update)
+    yield SimpleNamespace(bulk_update=bulk_update)
+
+
 @pytest.fixture(scope="function")
 def client():
     """Create a test client for the FastAPI app."""
     import main
 
-    with TestClient(main.app, raise_server_exceptions=False) as test_client:
-        yield test_client
+    # Run the lifespan without touching Postgres or starting the real Kafka consumer
+    with patch("main.init_db"), patch("main.start_kafka_consumer"):
+        with TestClient(main.app, raise_server_exceptions=False) as test_client:
+            yield test_client
 
 
 @pytest.fixture
 def sample_credit_report():
     """Sample credit report message for testing."""
-    return {
-        "application_id": "123e4567-e89b-12d3-a456-426614174000",
-        "pan_number": "ABCDE1234F",
-        "applicant_name": "John Doe",
-        "monthly_income": 50000.0,
-        "loan_amount": 500000.0,
-        "loan_type": "PERSONAL",
-        "status": "PENDING",
-        "cibil_score": 750,
-        "credit_check_completed_at": "2024-01-01T00:00:00",
-    }
-
-
-@pytest.fixture
-def sample_credit_reports():
-    """Multiple sample credit reports for testing."""
-    return [
+    return msgspec.convert(
         {
-            "application_id": "123e4567-e89b-12d3-a456-426614174001",
+            "application_id": "123e4567-e89b-12d3-a456-426614174000",
             "pan_number": "ABCDE1234F",
             "applicant_name": "John Doe",
             "monthly_income": 50000.0,
             "loan_amount": 500000.0,
             "loan_type": "PERSONAL",
+            "status": "PENDING",
             "cibil_score": 750,
+            "credit_check_completed_at": "2024-01-01T00:00:00",
         },
-        {
-            "application_id": "123e4567-e89b-12d3-a456-426614174002",
-            "pan_number": "FGHIJ5678K",
-            "applicant_name": "Jane Smith",
-            "monthly_income": 80000.0,
-            "loan_amount": 5000000.0,
-            "loan_type": "HOME",
-            "cibil_score": 600,
-        },
-        {
-            "application_id": "123e4567-e89b-12d3-a456-426614174003",
-            "pan_number": "XYZAB9012C",
-            "applicant_name": "Bob Johnson",
-            "monthly_income": 150000.0,
-            "loan_amount": 3000000.0,
-            "loan_type": "HOME",
-            "cibil_score": 800,
-        },
-    ]
+        CreditReport,
+    )
+
+
+@pytest.fixture
+def sample_credit_reports():
+    """Multiple sample credit reports for testing."""
+    return msgspec.convert(
+        [
+            {
+                "application_id": "123e4567-e89b-12d3-a456-426614174001",
+                "pan_number": "ABCDE1234F",
+                "applicant_name": "John Doe",
+                "monthly_income": 50000.0,
+                "loan_amount": 500000.0,
+                "loan_type": "PERSONAL",
+                "cibil_score": 750,
+            },
+            {
+                "application_id": "123e4567-e89b-12d3-a456-426614174002",
+                "pan_number": "FGHIJ5678K",
+                "applicant_name": "Jane Smith",
+                "monthly_income": 80000.0,
+                "loan_amount": 5000000.0,
+                "loan_type": "HOME",
+                "cibil_score": 600,
+            },
+            {
+                "application_id": "123e4567-e89b-12d3-a456-426614174003",
+                "pan_number": "XYZAB9012C",
+                "applicant_name": "Bob Johnson",
+                "monthly_income": 150000.0,
+                "loan_amount": 3000000.0,
+                "loan_type": "HOME",
+                "cibil_score": 800,
+            },
+        ],
+        List[CreditReport],
+    )
@@ -0,0 +1,23 @@
+from typing import Optional
+from uuid import UUID
+
+import msgspec
+
+
+class CreditReport(msgspec.Struct):
+    """
+    Credit report message from the credit_reports_generated topic.
+
+    Only the fields the decision needs are decoded; the rest of the forwarded
+    application data is skipped by the decoder.
+    """
+
+    application_id: UUID
+    cibil_score: Optional[int] = None
+    monthly_income: Optional[float] = None
+    loan_amount: Optional[float] = None
+
+
+# Decodes and validates a raw message in one pass; raises msgspec.DecodeError
+# (or its subclass msgspec.ValidationError) for malformed payloads
+decode_credit_report = msgspec.json.Decoder(CreditReport).decode
@@ -1,5 +1,7 @@
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,34 +31,72 @@ class DecisionEngine:
         Returns:
             Decision status: REJECTED, PRE_APPROVED, or MANUAL_REVIEW
         """
-        logger.info(f"Evaluating decision: CIBIL={cibil_score}, Income={monthly_income}, Loan={loan_amount}")
+        logger.info("Evaluating decision: CIBIL=%s, Income=%s, Loan=%s", cibil_score, monthly_income, loan_amount)
 
         # Rule 1: CIBIL score below minimum threshold
         if cibil_score < cls.MIN_CIBIL_SCORE:
-            logger.info(f"REJECTED: CIBIL score {cibil_score} < {cls.MIN_CIBIL_SCORE} (High Risk)")
+            logger.info("REJECTED: CIBIL score %s < %s (High Risk)", cibil_score, cls.MIN_CIBIL_SCORE)
             return "REJECTED"
 
-        # Calculate minimum required monthly income
-        # For a 4-year (48 months) loan, monthly EMI ≈ loan_amount / 48
-        minimum_monthly_income = loan_amount / cls.LOAN_TERM_MONTHS
-
-        logger.debug(f"Minimum required monthly income: {minimum_monthly_income:.2f}")
-        logger.debug(f"Actual monthly income: {monthly_income:.2f}")
-        if minimum_monthly_income > 0:
-            logger.debug(f"Income ratio: {monthly_income / minimum_monthly_income:.2f}x")
+        if logger.isEnabledFor(logging.DEBUG):
+            # For a 4-year (48 months) loan, monthly EMI ≈ loan_amount / 48
+            minimum_monthly_income = loan_amount / cls.LOAN_TERM_MONTHS
+            logger.debug("Minimum required monthly income: %.2f", minimum_monthly_income)
+            logger.debug("Actual monthly income: %.2f", monthly_income)
+            if minimum_monthly_income > 0:
+                logger.debug("Income ratio: %.2fx", monthly_income / minimum_monthly_income)
 
-        # Rule 2: Good CIBIL with sufficient income
-        if monthly_income > minimum_monthly_income:
+        # Rule 2: Good CIBIL with sufficient income, i.e. income > loan / 48. Compared in whole
+        # paise (income * 48 > loan) so amounts exactly at the threshold are not misjudged by
+        # float rounding.
+        if round(monthly_income * 100) * cls.LOAN_TERM_MONTHS > round(loan_amount * 100):
             logger.info(
-                f"PRE_APPROVED: CIBIL score {cibil_score} >= {cls.MIN_CIBIL_SCORE} "
-                f"and income {monthly_income:.2f} > required {minimum_monthly_income:.2f}"
+                "PRE_APPROVED: CIBIL score %s >= %s and income %.2f > loan %.2f / %s months",
+                cibil_score,
+                cls.MIN_CIBIL_SCORE,
+                monthly_income,
+                loan_amount,
+                cls.LOAN_TERM_MONTHS,
             )
             return "PRE_APPROVED"
 
         # Rule 3: Good CIBIL but tight income ratio
         logger.info(
-            f"MANUAL_REVIEW: CIBIL score {cibil_score} >= {cls.MIN_CIBIL_SCORE} "
-            f"but income {monthly_income:.2f} <= required {minimum_monthly_income:.2f} "
-            f"(Tight income ratio)"
+            "MANUAL_REVIEW: CIBIL score %s >= %s but income %.2f <= loan %.2f / %s months (Tight income ratio)",
+            cibil_score,
+            cls.MIN_CIBIL_SCORE,
+            monthly_income,
+            loan_amount,
+            cls.LOAN_TERM_MONTHS,
         )
         return "MANUAL_REVIEW"
+
+    @classmethod
+    def make_decision_batch(cls, cibil_score, monthly_income, loan_amount) -> np.ndarray:
+        """
+        Vectorized make_decision over equally sized arrays of applications.
+
+        Applies the same rules in one NumPy pass instead of one Python call per
+        application; nothing is logged per element.
+
+        Args:
+            cibil_score: Array-like of CIBIL scores
+            monthly_income: Array-like of monthly incomes in INR
+            loan_amount: Array-like of requested loan amounts in INR
+
+        Returns:
+            Array of decision statuses: REJECTED, PRE_APPROVED, or MANUAL_REVIEW
+        """
+        cibil_score = np.asarray(cibil_score)
+        monthly_income = np.asarray(monthly_income, dtype=np.float64)
+        loan_amount = np.asarray(loan_amount, dtype=np.float64)
+
+        return np.select(
+            [
+                cibil_score < cls.MIN_CIBIL_SCORE,
+                # Same whole-paise comparison as make_decision; rint results stay exact in float64
+                np.rint(monthly_income * 100) * cls.LOAN_TERM_MONTHS > np.rint(loan_amount * 100),
+            ],
+            ["REJECTED", "PRE_APPROVED"],
+            default="MANUAL_REVIEW",
+        )
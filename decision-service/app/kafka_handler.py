@@ -1,18 +1,23 @@
-import json
 import logging
 import os
 import sys
+import threading
 from typing import Callable
 
-from kafka import KafkaConsumer
+import msgspec
+from confluent_kafka import Consumer, KafkaException, Producer, TopicPartition
+from credit_report import decode_credit_report
 
-from database import SessionLocal
+from database import get_sessionmaker
 
 # Add parent directory to path to import database package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for delivering dead-lettered records before the batch is given up on
+DEAD_LETTER_FLUSH_TIMEOUT_SECONDS = 10
+
 
 class DecisionKafkaHandler:
     """
@@ -25,79 +30,187 @@ class DecisionKafkaHandler:
         bootstrap_servers: str = None,
         consumer_group: str = "decision-service-group",
         consume_topic: str = "credit_reports_generated",
+        batch_size: int = 1000,
+        batch_linger_ms: int = 200,
+        dead_letter_topic: str = "credit_reports_dead_letter",
+        max_batch_retries: int = 5,
+        retry_backoff_seconds: float = 0.5,
+        max_retry_backoff_seconds: float = 30.0,
     ):
         self.bootstrap_servers = bootstrap_servers or os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
         self.consumer_group = consumer_group
         self.consume_topic = consume_topic
+        self.batch_size = batch_size
+        self.batch_linger_ms = batch_linger_ms
+        self.dead_letter_topic = dead_letter_topic
+        self.max_batch_retries = max_batch_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_retry_backoff_seconds = max_retry_backoff_seconds
         self.consumer = None
+        self.dead_letter_producer = None
+        self._stop = threading.Event()
 
     def connect(self):
         """
         Connect to Kafka broker and initialize consumer.
         """
         try:
-            self.consumer = KafkaConsumer(
-                self.consume_topic,
-                bootstrap_servers=self.bootstrap_servers,
-                group_id=self.consumer_group,
-                value_deserializer=lambda m: json.loads(m.decode("utf-8")),
-                key_deserializer=lambda k: k.decode("utf-8") if k else None,
-                auto_offset_reset="earliest",
-                enable_auto_commit=True,
-                max_poll_interval_ms=300000,
+            self.consumer = Consumer(
+                {
+                    "bootstrap.servers": self.bootstrap_servers,
+                    "group.id": self.consumer_group,
+                    "auto.offset.reset": "earliest",
+                    "enable.auto.commit": False,
+                    "max.poll.interval.ms": 300000,
+                    # Let the broker accumulate larger fetches instead of replying with tiny ones
+                    "fetch.min.bytes": 32768,
+                    "fetch.wait.max.ms": 50,
+                    "max.partition.fetch.bytes": 1048576,
+                    "on_commit": self._on_commit,
+                }
+            )
+            self.consumer.subscribe([self.consume_topic])
+            self.dead_letter_producer = Producer(
+                {"bootstrap.servers": self.bootstrap_servers, "acks": "all", "enable.idempotence": True}
             )
 
-            logger.info(f"Connected to Kafka at {self.bootstrap_servers}")
-            logger.info(f"Consuming from topic: {self.consume_topic}")
-            logger.info(f"Consumer group: {self.consumer_group}")
+            logger.info("Connected to Kafka at %s", self.bootstrap_servers)
+            logger.info("Consuming from topic: %s", self.consume_topic)
+            logger.info("Consumer group: %s", self.consumer_group)
 
         except Exception as e:
-            logger.error(f"Failed to connect to Kafka: {e}")
+            logger.error("Failed to connect to Kafka: %s", e)
             raise
 
     def consume_and_process(self, message_handler: Callable):
         """
-        Consume messages from Kafka and process them with the provided handler.
+        Consume messages from Kafka in batches and process them with the provided handler.
 
-        The handler receives both the message and a database session.
+        Up to batch_size messages (or whatever arrived within batch_linger_ms) are handed
+        to the handler together with one database session, committed once. Offsets are
+        committed asynchronously, and only after the database commit succeeds; a failed
+        batch is rewound and consumed again (at-least-once) after an exponential backoff.
+        Once a batch has failed max_batch_retries times in a row, its records are published
+        to dead_letter_topic and their offsets committed, so one bad record or a long outage
+        cannot stall the partition forever.
 
         Args:
-            message_handler: Function to process each message with signature:
-                            message_handler(message: dict, db_session: Session)
+            message_handler: Function to process a batch with signature:
+                            message_handler(messages: List[CreditReport], db_session: Session)
         """
         if not self.consumer:
             raise RuntimeError("Kafka consumer not connected. Call connect() first.")
 
         logger.info("Starting to consume messages from Kafka...")
 
+        session_factory = get_sessionmaker()
+        linger_seconds = self.batch_linger_ms / 1000
+        failed_attempts = 0
         try:
-            for message in self.consumer:
-                db_session = SessionLocal()
+            while not self._stop.is_set():
+                records = self.consumer.consume(num_messages=self.batch_size, timeout=linger_seconds)
+                if not records:
+                    continue
+
+                messages = []
+                valid_records = []
+                first_offsets = {}
+                for record in records:
+                    if record.error():
+                        logger.error("Kafka error: %s", record.error())
+                        continue
+                    valid_records.append(record)
+                    first_offsets.setdefault((record.topic(), record.partition()), record.offset())
+                    try:
+                        messages.append(decode_credit_report(record.value()))
+                    except msgspec.DecodeError as e:
+                        logger.error("Skipping undecodable message at offset %s: %s", record.offset(), e)
+
+                if not first_offsets:
+                    continue
+
+                logger.info("Received %s messages from %s partitions", len(messages), len(first_offsets))
+
+                db_session = session_factory()
                 try:
-                    logger.info(
-                        f"Received message from topic {message.topic}, partition {message.partition}, offset {message.offset}"
-                    )
-                    logger.debug(f"Message key: {message.key}, value: {message.value}")
-
-                    # Process the message using the handler with database session
-                    message_handler(message.value, db_session)
+                    # Process the batch using the handler with database session
+                    message_handler(messages, db_session)
 
-                    # Commit the database transaction
+                    # Commit the database transaction, then the consumed offsets
                     db_session.commit()
+                    self.consumer.commit(asynchronous=True)
+                    failed_attempts = 0
 
                 except Exception as e:
-                    logger.error(f"Error processing message: {e}", exc_info=True)
                     db_session.rollback()
-                    # Continue processing other messages
+                    failed_attempts += 1
+                    if failed_attempts > self.max_batch_retries and self._dead_letter(valid_records, e):
+                        # The batch is parked on the dead-letter topic; move past it
+                        self.consumer.commit(asynchronous=False)
+                        failed_attempts = 0
+                        continue
+
+                    delay = min(self.retry_backoff_seconds * 2 ** (failed_attempts - 1), self.max_retry_backoff_seconds)
+                    logger.error(
+                        "Error processing batch (attempt %s), retrying in %.1fs: %s", failed_attempts, delay, e, exc_info=True
+                    )
+                    # Rewind so the batch is consumed again, after backing off
+                    for (topic, partition), offset in first_offsets.items():
+                        self.consumer.seek(TopicPartition(topic, partition, offset))
+                    self._stop.wait(delay)
                 finally:
                     db_session.close()
 
         except KeyboardInterrupt:
             logger.info("Consumer interrupted by user")
+        except KafkaException as e:
+            logger.error("Kafka error in consumer loop: %s", e, exc_info=True)
+            raise
         except Exception as e:
-            logger.error(f"Error in consumer loop: {e}", exc_info=True)
+            logger.error("Error in consumer loop: %s", e, exc_info=True)
             raise
 
+    def _dead_letter(self, records, error: Exception) -> bool:
+        """
+        Publish the raw records of a failed batch to the dead-letter topic.
+
+        Returns:
+            True once every record is delivered, False if the batch should be retried instead
+        """
+        logger.error(
+            "Batch failed %s times in a row; moving %s records to %s: %s",
+            self.max_batch_retries + 1,
+            len(records),
+            self.dead_letter_topic,
+            error,
+        )
+        try:
+            headers = [("error", str(error).encode("utf-8"))]
+            for record in records:
+                self.dead_letter_producer.produce(self.dead_letter_topic, key=record.key(), value=record.value(), headers=headers)
+            remaining = self.dead_letter_producer.flush(DEAD_LETTER_FLUSH_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.error("Failed to publish to dead-letter topic %s: %s", self.dead_letter_topic, e)
+            return False
+        if remaining:
+            logger.error("%s records were not delivered to dead-letter topic %s", remaining, self.dead_letter_topic)
+            return False
+        return True
+
+    def stop(self):
+        """
+        Ask the consumer loop to exit after the batch it is currently processing.
+
+        Safe to call from another thread; the consumer itself must only be closed by the
+        thread running the loop, since librdkafka handles are not thread-safe to close.
+        """
+        self._stop.set()
+
+    @staticmethod
+    def _on_commit(err, partitions):
+        if err is not None:
+            logger.error("Failed to commit offsets %s: %s", partitions, err)
+
     def close(self):
         """
         Close Kafka consumer connection.
@@ -105,3 +218,6 @@ class DecisionKafkaHandler:
         if self.consumer:
             self.consumer.close()
             logger.info("Kafka consumer closed")
+        if self.dead_letter_producer:
+            self.dead_letter_producer.flush(DEAD_LETTER_FLUSH_TIMEOUT_SECONDS)
+            self.dead_letter_producer = None
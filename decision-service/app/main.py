@@ -1,13 +1,16 @@
+import asyncio
 import logging
 import os
 import sys
 import threading
-import time
 from contextlib import asynccontextmanager
+from typing import List
 
+from credit_report import CreditReport
 from decision_engine import DecisionEngine
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from kafka_handler import DecisionKafkaHandler
 from sqlalchemy.orm import Session
 
@@ -24,64 +27,68 @@ logger = logging.getLogger(__name__)
 # Global Kafka handler
 kafka_handler = None
 
+# How long shutdown waits for the consumer thread to finish its batch and close
+CONSUMER_SHUTDOWN_TIMEOUT_SECONDS = 10
 
-def process_credit_report(message: dict, db_session: Session) -> None:
+# Health response shared by all requests; kafka_connected flips on connect/close
+_HEALTH = {
+    "status": "healthy",
+    "service": "decision-service",
+    "kafka_connected": False,
+}
+
+
+def process_credit_reports(reports: List[CreditReport], db_session: Session) -> None:
     """
-    Process credit report message and make decision.
+    Decide a batch of credit reports in one vectorized pass and write all decisions with one bulk update.
+
+    Reports without a CIBIL score go to manual review; reports missing the income or loan
+    amount are logged and left unchanged.
 
     Args:
-        message: Credit report data from Kafka
+        reports: Credit reports decoded from Kafka
         db_session: Database session
     """
-    try:
-        application_id = message.get("application_id")
-        cibil_score = message.get("cibil_score")
-        monthly_income = message.get("monthly_income")
-        loan_amount = message.get("loan_amount")
-
-        logger.info(
-            f"Processing decision for application {application_id}, "
-            f"CIBIL: {cibil_score}, Income: {monthly_income}, Loan: {loan_amount}"
-        )
-
-        # Check if CIBIL score is available
-        if cibil_score is None:
-            logger.error(f"CIBIL score not available for application {application_id}")
-            # Update status to indicate failure
-            from uuid import UUID
-
-            ApplicationCRUD.update_application_status(db_session, UUID(application_id), status="MANUAL_REVIEW")
-            return
-
-        # sleep for 1 min before updating the application status
-        time.sleep(60)
-
-        # Apply decision engine rules
-        decision_status = DecisionEngine.make_decision(
-            cibil_score=cibil_score,
-            monthly_income=monthly_income,
-            loan_amount=loan_amount,
-        )
-
-        logger.info(f"Decision for application {application_id}: {decision_status}")
-
-        # Update database with decision and CIBIL score
-        from uuid import UUID
-
-        updated_application = ApplicationCRUD.update_application_status(
-            db_session,
-            UUID(application_id),
-            status=decision_status,
-            cibil_score=cibil_score,
-        )
-
-        if updated_application:
-            logger.info(f"Database updated for application {application_id}: status={decision_status}, cibil_score={cibil_score}")
+    scored = [
+        report
+        for report in reports
+        if report.cibil_score is not None and report.monthly_income is not None and report.loan_amount is not None
+    ]
+    # Apply decision engine rules to every complete report at once
+    decisions = iter(
+        DecisionEngine.make_decision_batch(
+            [report.cibil_score for report in scored],
+            [report.monthly_income for report in scored],
+            [report.loan_amount for report in scored],
+        ).tolist()
+        if scored
+        else ()
+    )
+
+    updates = []
+    for report in reports:
+        if report.cibil_score is None:
+            logger.error("CIBIL score not available for application %s", report.application_id)
+            decision_status = "MANUAL_REVIEW"
+        elif report.monthly_income is None or report.loan_amount is None:
+            logger.error("Income or loan amount not available for application %s; leaving it unchanged", report.application_id)
+            continue
         else:
-            logger.warning(f"Application {application_id} not found in database")
+            decision_status = next(decisions)
+        logger.info("Decision for application %s: %s", report.application_id, decision_status)
+        updates.append({"application_id": report.application_id, "status": decision_status, "cibil_score": report.cibil_score})
 
-    except Exception as e:
-        logger.error(f"Error processing credit report: {e}", exc_info=True)
+    if not updates:
+        return
+
+    # Update database with all decisions and CIBIL scores
+    updated_count = ApplicationCRUD.bulk_update_application_status(db_session, updates)
+    if updated_count is None:
+        logger.info("Database updated for %s applications", len(updates))
+        return
+    logger.info("Database updated for %s of %s applications", updated_count, len(updates))
+    if updated_count < len(updates):
+        logger.warning("%s applications not found in database", len(updates) - updated_count)
 
 
 def start_kafka_consumer():
@@ -100,18 +107,20 @@ def start_kafka_consumer():
         )
 
         kafka_handler.connect()
+        _HEALTH["kafka_connected"] = True
         logger.info("Kafka consumer connected successfully")
 
-        # Start consuming messages with database session injection
-        kafka_handler.consume_and_process(process_credit_report)
+        # Start consuming message batches with database session injection
+        kafka_handler.consume_and_process(process_credit_reports)
 
     except KeyboardInterrupt:
         logger.info("Shutting down Kafka consumer...")
     except Exception as e:
-        logger.error(f"Error in Kafka consumer: {e}", exc_info=True)
+        logger.error("Error in Kafka consumer: %s", e, exc_info=True)
     finally:
         if kafka_handler:
             kafka_handler.close()
+        _HEALTH["kafka_connected"] = False
 
 
 @asynccontextmanager
@@ -120,11 +129,11 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Decision Service API...")
 
     try:
-        # Initialize database
-        init_db()
+        # Initialize database off the event loop
+        await asyncio.to_thread(init_db)
         logger.info("Database initialized successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+        logger.error("Failed to initialize database: %s", e)
 
     # Start Kafka consumer in a separate daemon thread
     consumer_thread = threading.Thread(target=start_kafka_consumer, daemon=True)
@@ -134,11 +143,13 @@ async def lifespan(app: FastAPI):
 
     yield
 
-    # Shutdown
+    # Shutdown: stop the consumer loop and let its thread close the handler
     logger.info("Shutting down Decision Service...")
-    global kafka_handler
     if kafka_handler:
-        kafka_handler.close()
+        kafka_handler.stop()
+    consumer_thread.join(timeout=CONSUMER_SHUTDOWN_TIMEOUT_SECONDS)
+    if consumer_thread.is_alive():
+        logger.warning("Kafka consumer thread did not stop within %s seconds", CONSUMER_SHUTDOWN_TIMEOUT_SECONDS)
 
 
 app = FastAPI(
@@ -148,14 +159,15 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Configure CORS (internal service: only when explicitly enabled)
+if os.getenv("ENABLE_CORS", "").lower() in ("1", "true", "yes"):
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 
 @app.get("/")
@@ -168,19 +180,24 @@ async def root():
     }
 
 
-@app.get("/health")
+@app.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """
     Health check endpoint.
     """
-    return {
-        "status": "healthy",
-        "service": "decision-service",
-        "kafka_connected": kafka_handler is not None,
-    }
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return ORJSONResponse(_HEALTH)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # Each worker runs its own Kafka consumer (same group) and creates its engine lazily after start
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8001,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
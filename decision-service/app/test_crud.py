@@ -0,0 +1,54 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from database.crud import ApplicationCRUD
+from database.models import Application
+
+
+def _create_application(db_session, pan_number: str, cibil_score=None):
+    """Store a PENDING application and return its id."""
+    application = ApplicationCRUD.create_application(
+        db_session,
+        pan_number=pan_number,
+        applicant_name="Test User",
+        monthly_income_inr=Decimal("50000"),
+        loan_amount_inr=Decimal("500000"),
+        loan_type="PERSONAL",
+        cibil_score=cibil_score,
+    )
+    return application.id
+
+
+class TestBulkUpdateApplicationStatus:
+    """Test cases for ApplicationCRUD.bulk_update_application_status against SQLite."""
+
+    def test_bulk_update_application_status(self, db_session):
+        """Test that known applications are updated, a None score is kept and unknown ids are skipped."""
+        approved_id = _create_application(db_session, "ABCDE1234F")
+        review_id = _create_application(db_session, "FGHIJ5678K", cibil_score=640)
+
+        updated_count = ApplicationCRUD.bulk_update_application_status(
+            db_session,
+            [
+                {"application_id": approved_id, "status": "PRE_APPROVED", "cibil_score": 750},
+                {"application_id": str(review_id), "status": "MANUAL_REVIEW", "cibil_score": None},
+                {"application_id": uuid4(), "status": "REJECTED", "cibil_score": 600},
+            ],
+        )
+
+        assert updated_count == 2
+        approved = db_session.get(Application, approved_id, populate_existing=True)
+        assert (approved.status, approved.cibil_score) == ("PRE_APPROVED", 750)
+        review = db_session.get(Application, review_id, populate_existing=True)
+        assert (review.status, review.cibil_score) == ("MANUAL_REVIEW", 640)
+
+    def test_bulk_update_application_status_invalidates_cached_status(self, db_session):
+        """Test that a status read before the update is not served from the cache afterwards."""
+        application_id = _create_application(db_session, "XYZAB9012C")
+        assert ApplicationCRUD.get_application_status(db_session, application_id) == "PENDING"
+
+        ApplicationCRUD.bulk_update_application_status(
+            db_session, [{"application_id": application_id, "status": "REJECTED", "cibil_score": 600}]
+        )
+
+        assert ApplicationCRUD.get_application_status(db_session, application_id) == "REJECTED"
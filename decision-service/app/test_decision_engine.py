@@ -1,216 +1,95 @@
+import numpy as np
+import pytest
 from decision_engine import DecisionEngine
 
 
 class TestDecisionEngine:
     """Test cases for loan pre-qualification decision logic."""
 
-    def test_rejected_low_cibil_score(self):
-        """Test that CIBIL score < 650 results in REJECTED."""
-        decision = DecisionEngine.make_decision(cibil_score=600, monthly_income=50000, loan_amount=500000)
-        assert decision == "REJECTED"
-
-    def test_rejected_very_low_cibil_score(self):
-        """Test that very low CIBIL score results in REJECTED."""
-        decision = DecisionEngine.make_decision(cibil_score=300, monthly_income=100000, loan_amount=500000)
-        assert decision == "REJECTED"
-
-    def test_rejected_cibil_just_below_threshold(self):
-        """Test CIBIL score just below 650 threshold."""
-        decision = DecisionEngine.make_decision(cibil_score=649, monthly_income=50000, loan_amount=500000)
-        assert decision == "REJECTED"
-
-    def test_rejected_regardless_of_income(self):
-        """Test that low CIBIL results in REJECTED even with high income."""
-        # Very high income but low CIBIL
-        decision = DecisionEngine.make_decision(cibil_score=600, monthly_income=1000000, loan_amount=500000)
-        assert decision == "REJECTED"
-
-    def test_pre_approved_good_cibil_sufficient_income(self):
-        """Test PRE_APPROVED with CIBIL >= 650 and sufficient income."""
-        # Income 50000, required = 500000/48 = 10416.67
-        # 50000 > 10416.67, so PRE_APPROVED
-        decision = DecisionEngine.make_decision(cibil_score=750, monthly_income=50000, loan_amount=500000)
-        assert decision == "PRE_APPROVED"
-
-    def test_pre_approved_excellent_cibil_high_income(self):
-        """Test PRE_APPROVED with excellent CIBIL and high income."""
-        decision = DecisionEngine.make_decision(cibil_score=850, monthly_income=150000, loan_amount=3000000)
-        assert decision == "PRE_APPROVED"
-
-    def test_pre_approved_cibil_at_threshold(self):
-        """Test PRE_APPROVED with CIBIL exactly at 650 threshold."""
-        # Income 30000, required = 500000/48 = 10416.67
-        # 30000 > 10416.67, so PRE_APPROVED
-        decision = DecisionEngine.make_decision(cibil_score=650, monthly_income=30000, loan_amount=500000)
-        assert decision == "PRE_APPROVED"
-
-    def test_manual_review_good_cibil_insufficient_income(self):
-        """Test MANUAL_REVIEW with good CIBIL but insufficient income."""
-        # Income 10000, required = 500000/48 = 10416.67
-        # 10000 < 10416.67, so MANUAL_REVIEW
-        decision = DecisionEngine.make_decision(cibil_score=750, monthly_income=10000, loan_amount=500000)
-        assert decision == "MANUAL_REVIEW"
-
-    def test_manual_review_income_exactly_at_threshold(self):
-        """Test MANUAL_REVIEW when income equals required amount."""
-        loan_amount = 500000
-        required_income = loan_amount / 48  # 10416.67
-
-        # Income exactly equal to required (should be MANUAL_REVIEW, not >)
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=required_income, loan_amount=loan_amount)
-        assert decision == "MANUAL_REVIEW"
-
-    def test_manual_review_income_just_below_threshold(self):
-        """Test MANUAL_REVIEW when income is just below required amount."""
-        loan_amount = 500000
-        required_income = loan_amount / 48  # 10416.67
-
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=required_income - 1, loan_amount=loan_amount)
-        assert decision == "MANUAL_REVIEW"
-
-    def test_pre_approved_income_just_above_threshold(self):
-        """Test PRE_APPROVED when income is just above required amount."""
-        loan_amount = 500000
-        required_income = loan_amount / 48  # 10416.67
-
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=required_income + 1, loan_amount=loan_amount)
-        assert decision == "PRE_APPROVED"
-
-    def test_small_loan_amount_low_income(self):
-        """Test decision with small loan amount and low income."""
-        # Loan 100000, required income = 100000/48 = 2083.33
-        # Income 5000 > 2083.33, so PRE_APPROVED
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=5000, loan_amount=100000)
-        assert decision == "PRE_APPROVED"
-
-    def test_large_loan_amount_high_income(self):
-        """Test decision with large loan amount and high income."""
-        # Loan 10000000, required income = 10000000/48 = 208333.33
-        # Income 250000 > 208333.33, so PRE_APPROVED
-        decision = DecisionEngine.make_decision(cibil_score=750, monthly_income=250000, loan_amount=10000000)
-        assert decision == "PRE_APPROVED"
-
-    def test_large_loan_amount_insufficient_income(self):
-        """Test MANUAL_REVIEW with large loan and insufficient income."""
-        # Loan 10000000, required income = 10000000/48 = 208333.33
-        # Income 150000 < 208333.33, so MANUAL_REVIEW
-        decision = DecisionEngine.make_decision(cibil_score=750, monthly_income=150000, loan_amount=10000000)
-        assert decision == "MANUAL_REVIEW"
+    @pytest.mark.parametrize(
+        "cibil, income, loan, expected",
+        [
+            # CIBIL < 650 is REJECTED regardless of income
+            pytest.param(600, 50000, 500000, "REJECTED", id="rejected_low_cibil_score"),
+            pytest.param(300, 100000, 500000, "REJECTED", id="rejected_very_low_cibil_score"),
+            pytest.param(649, 50000, 500000, "REJECTED", id="rejected_cibil_just_below_threshold"),
+            pytest.param(600, 1000000, 500000, "REJECTED", id="rejected_regardless_of_income"),
+            # CIBIL >= 650: PRE_APPROVED when income > loan / 48 (500000 / 48 = 10416.67)
+            pytest.param(750, 50000, 500000, "PRE_APPROVED", id="pre_approved_good_cibil_sufficient_income"),
+            pytest.param(850, 150000, 3000000, "PRE_APPROVED", id="pre_approved_excellent_cibil_high_income"),
+            pytest.param(650, 30000, 500000, "PRE_APPROVED", id="pre_approved_cibil_at_threshold"),
+            pytest.param(750, 10000, 500000, "MANUAL_REVIEW", id="manual_review_good_cibil_insufficient_income"),
+            # Income exactly equal to required is MANUAL_REVIEW (strict >); amounts are in whole paise
+            pytest.param(700, 10416.66, 499999.68, "MANUAL_REVIEW", id="manual_review_income_exactly_at_threshold"),
+            pytest.param(700, 10416.65, 499999.68, "MANUAL_REVIEW", id="manual_review_income_just_below_threshold"),
+            pytest.param(700, 10416.67, 499999.68, "PRE_APPROVED", id="pre_approved_income_just_above_threshold"),
+            # Loan amount not a multiple of 48: 1032942.18 * 48 == 49581224.64 exactly
+            pytest.param(700, 1032942.18, 49581224.64, "MANUAL_REVIEW", id="manual_review_at_threshold_paise_amounts"),
+            pytest.param(700, 1032942.19, 49581224.64, "PRE_APPROVED", id="pre_approved_one_paisa_above_paise_threshold"),
+            pytest.param(700, 5000, 100000, "PRE_APPROVED", id="small_loan_amount_low_income"),  # required 2083.33
+            pytest.param(750, 250000, 10000000, "PRE_APPROVED", id="large_loan_amount_high_income"),  # required 208333.33
+            pytest.param(750, 150000, 10000000, "MANUAL_REVIEW", id="large_loan_amount_insufficient_income"),
+            pytest.param(700, 1000, 10000, "PRE_APPROVED", id="edge_case_minimum_loan_amount"),  # required 208.33
+            pytest.param(850, 500000, 20000000, "PRE_APPROVED", id="edge_case_maximum_loan_amount"),  # required 416666.67
+            pytest.param(700, 10001, 480000, "PRE_APPROVED", id="loan_term_calculation"),  # just above 480000 / 48
+            pytest.param(700, 1, 0, "PRE_APPROVED", id="zero_loan_amount"),  # required 0
+            pytest.param(700, 100, 1000, "PRE_APPROVED", id="very_small_loan_very_low_income"),  # required 20.83
+            # Typical loan scenarios
+            pytest.param(750, 50000, 500000, "PRE_APPROVED", id="personal_loan_scenario"),
+            pytest.param(750, 150000, 5000000, "PRE_APPROVED", id="home_loan_scenario"),  # required 104166.67
+            pytest.param(700, 40000, 800000, "PRE_APPROVED", id="auto_loan_scenario"),  # required 16666.67
+            pytest.param(720, 80000, 2000000, "PRE_APPROVED", id="business_loan_scenario"),  # required 41666.67
+        ],
+    )
+    def test_decision(self, cibil, income, loan, expected):
+        """Test the decision for a CIBIL score, monthly income and loan amount."""
+        assert DecisionEngine.make_decision(cibil_score=cibil, monthly_income=income, loan_amount=loan) == expected
 
     def test_income_ratio_calculations(self):
         """Test various income to loan ratios."""
-        test_cases = [
-            # (cibil, income, loan, expected)
-            (700, 20000, 500000, "PRE_APPROVED"),  # 20000 > 10416.67
-            (700, 10000, 500000, "MANUAL_REVIEW"),  # 10000 < 10416.67
-            (700, 50000, 1000000, "PRE_APPROVED"),  # 50000 > 20833.33
-            (700, 15000, 1000000, "MANUAL_REVIEW"),  # 15000 < 20833.33
-            (700, 100000, 2000000, "PRE_APPROVED"),  # 100000 > 41666.67
-            (700, 30000, 2000000, "MANUAL_REVIEW"),  # 30000 < 41666.67
-        ]
+        # (cibil, income, loan, expected)
+        cibil, income, loan, expected = (
+            np.array(column)
+            for column in zip(
+                (700, 20000, 500000, "PRE_APPROVED"),  # 20000 > 10416.67
+                (700, 10000, 500000, "MANUAL_REVIEW"),  # 10000 < 10416.67
+                (700, 50000, 1000000, "PRE_APPROVED"),  # 50000 > 20833.33
+                (700, 15000, 1000000, "MANUAL_REVIEW"),  # 15000 < 20833.33
+                (700, 100000, 2000000, "PRE_APPROVED"),  # 100000 > 41666.67
+                (700, 30000, 2000000, "MANUAL_REVIEW"),  # 30000 < 41666.67
+                (700, 1032942.18, 49581224.64, "MANUAL_REVIEW"),  # exactly 49581224.64 / 48
+            )
+        )
 
-        for cibil, income, loan, expected in test_cases:
-            decision = DecisionEngine.make_decision(cibil_score=cibil, monthly_income=income, loan_amount=loan)
-            assert (
-                decision == expected
-            ), f"Failed for CIBIL={cibil}, Income={income}, Loan={loan}. Expected {expected}, got {decision}"
+        assert np.array_equal(DecisionEngine.make_decision_batch(cibil, income, loan), expected)
 
-    def test_edge_case_minimum_loan_amount(self):
-        """Test with minimum realistic loan amount."""
-        # Very small loan
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=1000, loan_amount=10000)
-        # Required income = 10000/48 = 208.33
-        # 1000 > 208.33, so PRE_APPROVED
-        assert decision == "PRE_APPROVED"
-
-    def test_edge_case_maximum_loan_amount(self):
-        """Test with very large loan amount."""
-        # Very large loan
-        decision = DecisionEngine.make_decision(cibil_score=850, monthly_income=500000, loan_amount=20000000)
-        # Required income = 20000000/48 = 416666.67
-        # 500000 > 416666.67, so PRE_APPROVED
-        assert decision == "PRE_APPROVED"
+        # The scalar path must agree with the batch path
+        actual = [DecisionEngine.make_decision(int(c), float(i), float(la)) for c, i, la in zip(cibil, income, loan)]
+        assert np.array_equal(np.array(actual), expected)
 
     def test_various_cibil_scores_above_threshold(self):
         """Test that all CIBIL scores >= 650 follow income rules."""
-        cibil_scores = [650, 700, 750, 800, 850, 900]
+        cibil_scores = np.array([650, 700, 750, 800, 850, 900])
+        loan_amounts = np.full(cibil_scores.shape, 500000)
 
-        for cibil in cibil_scores:
-            # With sufficient income
-            decision = DecisionEngine.make_decision(cibil_score=cibil, monthly_income=50000, loan_amount=500000)
-            assert decision == "PRE_APPROVED"
+        # With sufficient income
+        decisions = DecisionEngine.make_decision_batch(cibil_scores, np.full(cibil_scores.shape, 50000), loan_amounts)
+        assert np.all(decisions == "PRE_APPROVED")
 
-            # With insufficient income
-            decision = DecisionEngine.make_decision(cibil_score=cibil, monthly_income=5000, loan_amount=500000)
-            assert decision == "MANUAL_REVIEW"
+        # With insufficient income
+        decisions = DecisionEngine.make_decision_batch(cibil_scores, np.full(cibil_scores.shape, 5000), loan_amounts)
+        assert np.all(decisions == "MANUAL_REVIEW")
 
     def test_various_cibil_scores_below_threshold(self):
         """Test that all CIBIL scores < 650 are REJECTED."""
-        cibil_scores = [300, 400, 500, 600, 649]
-
-        for cibil in cibil_scores:
-            decision = DecisionEngine.make_decision(
-                cibil_score=cibil,
-                monthly_income=100000,  # Very high income
-                loan_amount=500000,
-            )
-            assert decision == "REJECTED"
-
-    def test_loan_term_calculation(self):
-        """Test that loan term is correctly set to 48 months."""
-        # Verify the constant
-        assert DecisionEngine.LOAN_TERM_MONTHS == 48
-
-        # Verify calculation uses 48 months
-        loan_amount = 480000  # Divisible by 48
-        monthly_income = 10001  # Just above 480000/48 = 10000
-
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=monthly_income, loan_amount=loan_amount)
-        assert decision == "PRE_APPROVED"
+        cibil_scores = np.array([300, 400, 500, 600, 649])
 
-    def test_zero_loan_amount(self):
-        """Test behavior with zero loan amount (edge case)."""
-        # Required income = 0/48 = 0
-        # Any positive income > 0, so PRE_APPROVED
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=1, loan_amount=0)
-        assert decision == "PRE_APPROVED"
-
-    def test_very_small_loan_very_low_income(self):
-        """Test with minimal loan and minimal income."""
-        # Loan 1000, required income = 1000/48 = 20.83
-        # Income 100 > 20.83, so PRE_APPROVED
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=100, loan_amount=1000)
-        assert decision == "PRE_APPROVED"
-
-    def test_personal_loan_scenario(self):
-        """Test typical personal loan scenario."""
-        # Personal loan: 500K, income: 50K
-        decision = DecisionEngine.make_decision(cibil_score=750, monthly_income=50000, loan_amount=500000)
-        assert decision == "PRE_APPROVED"
-
-    def test_home_loan_scenario(self):
-        """Test typical home loan scenario."""
-        # Home loan: 5M, income: 150K
-        decision = DecisionEngine.make_decision(cibil_score=750, monthly_income=150000, loan_amount=5000000)
-        # Required = 5000000/48 = 104166.67
-        # 150000 > 104166.67, so PRE_APPROVED
-        assert decision == "PRE_APPROVED"
-
-    def test_auto_loan_scenario(self):
-        """Test typical auto loan scenario."""
-        # Auto loan: 800K, income: 40K
-        decision = DecisionEngine.make_decision(cibil_score=700, monthly_income=40000, loan_amount=800000)
-        # Required = 800000/48 = 16666.67
-        # 40000 > 16666.67, so PRE_APPROVED
-        assert decision == "PRE_APPROVED"
-
-    def test_business_loan_scenario(self):
-        """Test typical business loan scenario."""
-        # Business loan: 2M, income: 80K
-        decision = DecisionEngine.make_decision(cibil_score=720, monthly_income=80000, loan_amount=2000000)
-        # Required = 2000000/48 = 41666.67
-        # 80000 > 41666.67, so PRE_APPROVED
-        assert decision == "PRE_APPROVED"
+        decisions = DecisionEngine.make_decision_batch(
+            cibil_scores,
+            np.full(cibil_scores.shape, 100000),  # Very high income
+            np.full(cibil_scores.shape, 500000),
+        )
+        assert np.all(decisions == "REJECTED")
 
 
 class TestDecisionEngineConstants:
@@ -263,6 +142,23 @@ class TestDecisionEngineEdgeCases:
         )
         assert decision == "PRE_APPROVED"
 
+    def test_income_boundary_paise_amounts(self):
+        """Test the threshold over many paise amounts where loan_amount is exactly income * 48."""
+        rng = np.random.default_rng(0)
+        income_paise = rng.integers(100, 10_000_000_00, size=20_000)
+        income = income_paise / 100
+        loan = income_paise * 48 / 100
+        cibil = np.full(income.shape, 700)
+
+        # At the threshold, one paisa above it, and with the loan one paisa above it
+        cases = [(income, loan, "MANUAL_REVIEW"), (income + 0.01, loan, "PRE_APPROVED"), (income, loan + 0.01, "MANUAL_REVIEW")]
+        for case_income, case_loan, expected in cases:
+            assert (DecisionEngine.make_decision_batch(cibil, case_income, case_loan) == expected).all()
+            scalar = {
+                DecisionEngine.make_decision(700, float(i), float(la)) for i, la in zip(case_income[:2000], case_loan[:2000])
+            }
+            assert scalar == {expected}
+
     def test_extreme_values(self):
         """Test with extreme but valid values."""
         # Maximum CIBIL, very high income
@@ -0,0 +1,73 @@
+import threading
+from unittest.mock import Mock, call
+
+import pytest
+from kafka_handler import DecisionKafkaHandler
+
+REPORT = b'{"application_id": "123e4567-e89b-12d3-a456-426614174000", "cibil_score": 750}'
+
+
+def _record(offset: int) -> Mock:
+    """Kafka record stand-in for one credit report at the given offset of partition 0."""
+    record = Mock()
+    record.error.return_value = None
+    record.topic.return_value = "credit_reports_generated"
+    record.partition.return_value = 0
+    record.offset.return_value = offset
+    record.key.return_value = b"key"
+    record.value.return_value = REPORT
+    return record
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    """Handler with mocked consumer, dead-letter producer and sessions, retrying twice without real delays."""
+    monkeypatch.setattr("kafka_handler.get_sessionmaker", lambda: Mock)
+    handler = DecisionKafkaHandler(max_batch_retries=2, retry_backoff_seconds=0.001)
+    handler.consumer = Mock()
+    handler.consumer.consume.return_value = [_record(5), _record(6)]
+    handler.dead_letter_producer = Mock()
+    handler.dead_letter_producer.flush.return_value = 0
+    handler._stop = Mock(wraps=threading.Event())
+    return handler
+
+
+class TestConsumeAndProcess:
+    """Test cases for retrying failed batches in DecisionKafkaHandler.consume_and_process."""
+
+    def test_failing_batch_backs_off_then_goes_to_dead_letter(self, handler):
+        """Test that a batch that keeps failing is retried with backoff, dead-lettered and committed."""
+        message_handler = Mock(side_effect=Exception("Database error"))
+        # Stop once the dead-lettered batch is committed
+        handler.consumer.commit.side_effect = lambda **kwargs: handler.stop()
+
+        handler.consume_and_process(message_handler)
+
+        assert message_handler.call_count == 3
+        assert handler._stop.wait.call_args_list == [call(0.001), call(0.002)]
+        assert handler.consumer.seek.call_count == 2
+        assert handler.dead_letter_producer.produce.call_count == 2
+        assert handler.dead_letter_producer.produce.call_args.args == ("credit_reports_dead_letter",)
+        assert handler.dead_letter_producer.produce.call_args.kwargs["value"] == REPORT
+        handler.consumer.commit.assert_called_once_with(asynchronous=False)
+
+    def test_undelivered_dead_letter_keeps_retrying(self, handler):
+        """Test that offsets are not committed when the dead-letter topic cannot be written."""
+        message_handler = Mock(side_effect=Exception("Database error"))
+        # Stop after the first dead-letter attempt fails
+        handler.dead_letter_producer.flush.side_effect = lambda timeout: handler.stop() or 2
+
+        handler.consume_and_process(message_handler)
+
+        handler.consumer.commit.assert_not_called()
+        assert handler.consumer.seek.call_count == 3
+
+    def test_success_resets_failed_attempts(self, handler):
+        """Test that a successful batch resets the retry count."""
+        message_handler = Mock(side_effect=[Exception("Database error"), None, Exception("Database error"), None])
+        handler.consumer.commit.side_effect = lambda **kwargs: message_handler.call_count == 4 and handler.stop()
+
+        handler.consume_and_process(message_handler)
+
+        assert handler._stop.wait.call_args_list == [call(0.001), call(0.001)]
+        handler.dead_letter_producer.produce.assert_not_called()
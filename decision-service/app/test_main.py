@@ -1,223 +1,158 @@
 import os
 import sys
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from uuid import UUID, uuid4
 
-from main import process_credit_report
+import msgspec
+import pytest
+from credit_report import CreditReport, decode_credit_report
+from decision_engine import DecisionEngine
+from main import process_credit_reports
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 
-class TestProcessCreditReport:
-    """Test cases for the process_credit_report function."""
+def _report(message: dict) -> CreditReport:
+    """Build a CreditReport from a message dict the way the consumer decodes it."""
+    return msgspec.convert(message, CreditReport)
 
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_pre_approved(self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_report):
-        """Test processing credit report that results in PRE_APPROVED."""
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.return_value = MagicMock()
 
-        process_credit_report(sample_credit_report, db_session)
+# (pan_number, cibil_score, monthly_income, loan_amount, expected status; None leaves the application PENDING)
+_DECISION_CASES = [
+    pytest.param("KLMNO1234P", 750, 50000.0, 500000.0, "PRE_APPROVED", id="approve"),
+    pytest.param("KLMNO1234P", 600, 50000.0, 500000.0, "REJECTED", id="reject"),
+    pytest.param("KLMNO1234P", 750, 10000.0, 500000.0, "MANUAL_REVIEW", id="manual_review"),
+    pytest.param("ABCDE1234F", 790, 50000.0, 500000.0, "PRE_APPROVED", id="test_pan_good_credit"),
+    pytest.param("FGHIJ5678K", 610, 50000.0, 500000.0, "REJECTED", id="test_pan_below_average_credit"),
+    pytest.param("KLMNO1234P", None, 50000.0, 500000.0, "MANUAL_REVIEW", id="missing_cibil"),
+    pytest.param("KLMNO1234P", 750, None, 500000.0, None, id="missing_income_stays_pending"),
+]
 
-        # Verify decision engine was called
-        mock_decision.assert_called_once_with(cibil_score=750, monthly_income=50000.0, loan_amount=500000.0)
 
-        # Verify database update
-        mock_update.assert_called_once()
-        call_args = mock_update.call_args
-        assert isinstance(call_args[0][1], UUID)  # application_id is UUID
-        assert call_args[1]["status"] == "PRE_APPROVED"
-        assert call_args[1]["cibil_score"] == 750
+class TestProcessCreditReports:
+    """Test cases for the process_credit_reports function."""
 
-        # Verify sleep was called (1 minute delay)
-        mock_sleep.assert_called_once_with(60)
+    @staticmethod
+    def _updates(decision_mocks):
+        """Return the updates passed to the single bulk update call."""
+        decision_mocks.bulk_update.assert_called_once()
+        return decision_mocks.bulk_update.call_args[0][1]
 
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_rejected(self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_report):
-        """Test processing credit report that results in REJECTED."""
-        mock_decision.return_value = "REJECTED"
-        mock_update.return_value = MagicMock()
-        sample_credit_report["cibil_score"] = 600
+    @pytest.mark.parametrize("pan_number, cibil_score, monthly_income, loan_amount, expected", _DECISION_CASES)
+    def test_process_credit_reports_decision(
+        self, decision_mocks, db_session, pan_number, cibil_score, monthly_income, loan_amount, expected
+    ):
+        """Test the status written for a single credit report."""
+        report = _report(
+            {
+                "application_id": str(uuid4()),
+                "pan_number": pan_number,
+                "cibil_score": cibil_score,
+                "monthly_income": monthly_income,
+                "loan_amount": loan_amount,
+            }
+        )
+
+        process_credit_reports([report], db_session)
+
+        if expected is None:
+            decision_mocks.bulk_update.assert_not_called()
+            return
+        (update,) = self._updates(decision_mocks)
+        assert update == {"application_id": report.application_id, "status": expected, "cibil_score": cibil_score}
+
+    def test_process_credit_reports_decision_table_as_one_batch(self, decision_mocks, db_session):
+        """Test that deciding every case of the table in one batch gives the same per-report results."""
+        reports = []
+        expected_statuses = {}
+        for case in _DECISION_CASES:
+            pan_number, cibil_score, monthly_income, loan_amount, expected = case.values
+            report = _report(
+                {
+                    "application_id": str(uuid4()),
+                    "pan_number": pan_number,
+                    "cibil_score": cibil_score,
+                    "monthly_income": monthly_income,
+                    "loan_amount": loan_amount,
+                }
+            )
+            reports.append(report)
+            if expected is not None:
+                expected_statuses[report.application_id] = expected
+
+        process_credit_reports(reports, db_session)
+
+        updates = self._updates(decision_mocks)
+        assert {u["application_id"]: u["status"] for u in updates} == expected_statuses
+
+    def test_process_credit_reports_pre_approved(self, decision_mocks, db_session, sample_credit_report):
+        """Test processing credit report that results in PRE_APPROVED."""
+        process_credit_reports([sample_credit_report], db_session)
 
-        process_credit_report(sample_credit_report, db_session)
+        # Verify database update
+        (update,) = self._updates(decision_mocks)
+        assert isinstance(update["application_id"], UUID)  # application_id is UUID
+        assert update["status"] == "PRE_APPROVED"
+        assert update["cibil_score"] == 750
 
-        mock_decision.assert_called_once_with(cibil_score=600, monthly_income=50000.0, loan_amount=500000.0)
+    def test_process_credit_reports_application_not_found(self, decision_mocks, db_session, sample_credit_report):
+        """Test processing when application doesn't exist in database."""
+        decision_mocks.bulk_update.side_effect = None
+        decision_mocks.bulk_update.return_value = 0  # Simulate not found
 
-        # Verify database update
-        call_args = mock_update.call_args
-        assert call_args[1]["status"] == "REJECTED"
-        assert call_args[1]["cibil_score"] == 600
-
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_manual_review(self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_report):
-        """Test processing credit report that results in MANUAL_REVIEW."""
-        mock_decision.return_value = "MANUAL_REVIEW"
-        mock_update.return_value = MagicMock()
-        sample_credit_report["cibil_score"] = 750
-        sample_credit_report["monthly_income"] = 10000.0
-
-        process_credit_report(sample_credit_report, db_session)
-
-        mock_decision.assert_called_once_with(cibil_score=750, monthly_income=10000.0, loan_amount=500000.0)
-
-        call_args = mock_update.call_args
-        assert call_args[1]["status"] == "MANUAL_REVIEW"
-
-    # @patch('main.time.sleep')
-    # @patch('main.DecisionEngine.make_decision')
-    # @patch('main.ApplicationCRUD.update_application_status')
-    # def test_process_credit_report_application_not_found(
-    #     self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_report
-    # ):
-    #     """Test processing when application doesn't exist in database."""
-    #     mock_decision.return_value = "PRE_APPROVED"
-    #     mock_update.return_value = None  # Simulate not found
-    #
-    #     # Should not raise exception, just log warning
-    #     process_credit_report(sample_credit_report, db_session)
-    #
-    #     # Verify decision was still made
-    #     mock_decision.assert_called_once()
-    #     mock_update.assert_called_once()
-
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_decision_engine_error(
-        self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_report
-    ):
-        """Test handling of decision engine errors."""
-        mock_decision.side_effect = Exception("Decision engine error")
-
-        # Should not raise exception, just log error
-        process_credit_report(sample_credit_report, db_session)
-
-        # Update should not be called due to error
-        mock_update.assert_not_called()
-
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_database_error(self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_report):
-        """Test handling of database update errors."""
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.side_effect = Exception("Database error")
-
-        # Should not raise exception, just log error
-        process_credit_report(sample_credit_report, db_session)
-
-        # Decision should still have been called
-        mock_decision.assert_called_once()
-
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_extracts_correct_fields(self, mock_update, mock_decision, mock_sleep, db_session):
-        """Test that correct fields are extracted from message."""
-        message = {
-            "application_id": "123e4567-e89b-12d3-a456-426614174000",
-            "cibil_score": 780,
-            "monthly_income": 75000.0,
-            "loan_amount": 1500000.0,
-            "extra_field": "ignored",
-        }
+        # Should not raise exception, just log warning
+        process_credit_reports([sample_credit_report], db_session)
 
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.return_value = MagicMock()
+        decision_mocks.bulk_update.assert_called_once()
 
-        process_credit_report(message, db_session)
+    def test_process_credit_reports_skips_incomplete_report(self, decision_mocks, db_session, sample_credit_reports):
+        """Test that an incomplete report does not drop the rest of the batch."""
+        sample_credit_reports[1].loan_amount = None
 
-        # Verify correct values were passed
-        mock_decision.assert_called_once_with(cibil_score=780, monthly_income=75000.0, loan_amount=1500000.0)
+        process_credit_reports(sample_credit_reports, db_session)
 
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_various_decisions(
-        self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_reports
-    ):
-        """Test processing multiple credit reports with different decisions."""
-        decisions = ["PRE_APPROVED", "REJECTED", "MANUAL_REVIEW"]
-        mock_update.return_value = MagicMock()
-
-        for i, report in enumerate(sample_credit_reports):
-            mock_decision.return_value = decisions[i]
-            process_credit_report(report, db_session)
-
-        # Verify all were processed
-        assert mock_decision.call_count == 3
-        assert mock_update.call_count == 3
-
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_high_cibil_high_income(self, mock_update, mock_decision, mock_sleep, db_session):
-        """Test processing with high CIBIL and high income."""
-        message = {
-            "application_id": str(uuid4()),
-            "cibil_score": 850,
-            "monthly_income": 200000.0,
-            "loan_amount": 5000000.0,
-        }
+        updates = self._updates(decision_mocks)
+        assert [u["application_id"] for u in updates] == [
+            sample_credit_reports[0].application_id,
+            sample_credit_reports[2].application_id,
+        ]
 
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.return_value = MagicMock()
+    def test_process_credit_reports_database_error(self, decision_mocks, db_session, sample_credit_report):
+        """Test that database update errors propagate so the consumer retries the batch."""
+        decision_mocks.bulk_update.side_effect = Exception("Database error")
 
-        process_credit_report(message, db_session)
+        with pytest.raises(Exception, match="Database error"):
+            process_credit_reports([sample_credit_report], db_session)
 
-        mock_decision.assert_called_once_with(cibil_score=850, monthly_income=200000.0, loan_amount=5000000.0)
+    def test_process_credit_reports_decoded_message(self, decision_mocks, db_session):
+        """Test that a decoded message with extra fields is decided from its decision fields."""
+        report = decode_credit_report(
+            b'{"application_id": "123e4567-e89b-12d3-a456-426614174000", "cibil_score": 780, '
+            b'"monthly_income": 75000, "loan_amount": 1500000.0, "extra_field": "ignored"}'
+        )
 
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_low_cibil(self, mock_update, mock_decision, mock_sleep, db_session):
-        """Test processing with low CIBIL score."""
-        message = {
-            "application_id": str(uuid4()),
-            "cibil_score": 500,
-            "monthly_income": 50000.0,
-            "loan_amount": 500000.0,
-        }
+        process_credit_reports([report], db_session)
 
-        mock_decision.return_value = "REJECTED"
-        mock_update.return_value = MagicMock()
+        (update,) = self._updates(decision_mocks)
+        assert update == {
+            "application_id": UUID("123e4567-e89b-12d3-a456-426614174000"),
+            "status": "PRE_APPROVED",
+            "cibil_score": 780,
+        }
 
-        process_credit_report(message, db_session)
+    def test_process_credit_reports_single_bulk_update(self, decision_mocks, db_session, sample_credit_reports):
+        """Test that a batch is decided in one vectorized call and written with one bulk update, in report order."""
+        with patch("main.DecisionEngine.make_decision_batch", wraps=DecisionEngine.make_decision_batch) as mock_batch:
+            process_credit_reports(sample_credit_reports, db_session)
 
-        call_args = mock_update.call_args
-        assert call_args[1]["status"] == "REJECTED"
-        assert call_args[1]["cibil_score"] == 500
+        mock_batch.assert_called_once()
+        updates = self._updates(decision_mocks)
+        assert [u["application_id"] for u in updates] == [report.application_id for report in sample_credit_reports]
+        assert [u["status"] for u in updates] == ["PRE_APPROVED", "REJECTED", "PRE_APPROVED"]
+        assert [u["cibil_score"] for u in updates] == [750, 600, 800]
 
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_both_cibil_and_status_updated(
-        self, mock_update, mock_decision, mock_sleep, db_session, sample_credit_report
-    ):
-        """Test that both status and CIBIL score are updated in database."""
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.return_value = MagicMock()
-
-        process_credit_report(sample_credit_report, db_session)
-
-        # Verify both parameters are passed to update
-        call_args = mock_update.call_args
-        assert "status" in call_args[1]
-        assert "cibil_score" in call_args[1]
-        assert call_args[1]["status"] == "PRE_APPROVED"
-        assert call_args[1]["cibil_score"] == 750
-
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_edge_case_cibil_at_threshold(self, mock_update, mock_decision, mock_sleep, db_session):
+    def test_process_credit_reports_edge_case_cibil_at_threshold(self, decision_mocks, db_session):
         """Test processing with CIBIL score at decision threshold."""
         message = {
             "application_id": str(uuid4()),
@@ -226,52 +161,51 @@ class TestProcessCreditReport:
             "loan_amount": 500000.0,
         }
 
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.return_value = MagicMock()
+        process_credit_reports([_report(message)], db_session)
 
-        process_credit_report(message, db_session)
+        (update,) = self._updates(decision_mocks)
+        assert update["status"] == "PRE_APPROVED"
 
-        mock_decision.assert_called_once_with(cibil_score=650, monthly_income=50000.0, loan_amount=500000.0)
+    def test_process_credit_reports_empty_batch(self, decision_mocks, db_session):
+        """Test that an empty batch does not touch the database."""
+        process_credit_reports([], db_session)
 
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_data_types(self, mock_update, mock_decision, mock_sleep, db_session):
-        """Test that correct data types are used in processing."""
-        message = {
-            "application_id": "123e4567-e89b-12d3-a456-426614174000",
-            "cibil_score": 750,  # int
-            "monthly_income": 50000.0,  # float
-            "loan_amount": 500000.0,  # float
-        }
+        decision_mocks.bulk_update.assert_not_called()
 
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.return_value = MagicMock()
 
-        process_credit_report(message, db_session)
+class TestCreditReport:
+    """Test cases for decoding credit report messages."""
 
-        call_args = mock_decision.call_args
-        assert isinstance(call_args[1]["cibil_score"], int)
-        assert isinstance(call_args[1]["monthly_income"], float)
-        assert isinstance(call_args[1]["loan_amount"], float)
+    def test_decode_credit_report_ignores_extra_fields(self):
+        """Test that only the decision fields are decoded."""
+        report = decode_credit_report(
+            b'{"application_id": "123e4567-e89b-12d3-a456-426614174000", "pan_number": "ABCDE1234F", '
+            b'"cibil_score": 750, "monthly_income": 50000, "loan_amount": 500000.0}'
+        )
 
-    @patch("main.time.sleep")
-    @patch("main.DecisionEngine.make_decision")
-    @patch("main.ApplicationCRUD.update_application_status")
-    def test_process_credit_report_missing_optional_fields(self, mock_update, mock_decision, mock_sleep, db_session):
-        """Test processing with only required fields."""
-        message = {
-            "application_id": str(uuid4()),
-            "cibil_score": 750,
-            "monthly_income": 50000.0,
-            "loan_amount": 500000.0,
-        }
+        assert report == CreditReport(
+            application_id=UUID("123e4567-e89b-12d3-a456-426614174000"),
+            cibil_score=750,
+            monthly_income=50000.0,
+            loan_amount=500000.0,
+        )
+        assert isinstance(report.monthly_income, float)
+
+    def test_decode_credit_report_invalid_application_id(self):
+        """Test that a malformed application id is rejected while decoding."""
+        with pytest.raises(msgspec.DecodeError):
+            decode_credit_report(b'{"application_id": "invalid-uuid", "cibil_score": 750}')
+
+
+class TestHealthCheck:
+    """Test cases for the health check endpoint."""
 
-        mock_decision.return_value = "PRE_APPROVED"
-        mock_update.return_value = MagicMock()
+    def test_health_check_reports_kafka_state(self, client):
+        """Test that /health reflects the shared connection state."""
+        import main
 
-        # Should process successfully
-        process_credit_report(message, db_session)
+        with patch.dict(main._HEALTH, {"kafka_connected": True}):
+            response = client.get("/health")
 
-        mock_decision.assert_called_once()
-        mock_update.assert_called_once()
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy", "service": "decision-service", "kafka_connected": True}
@@ -6,6 +6,7 @@ This script creates all database tables based on SQLAlchemy models.
 Run this script after starting the PostgreSQL database to initialize the schema.
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -13,7 +14,7 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from database.database import Base, engine  # noqa: E402
+from database.database import Base, get_engine  # noqa: E402
 from database.database import init_db as db_init_db  # noqa: E402
 
 # Import models to ensure they're registered with Base
@@ -27,24 +28,32 @@ def init_db_verbose():
         db_init_db()  # Use the function from database.database
         print("✓ Database tables created successfully!")
         print("\nCreated tables:")
-        for table_name in Base.metadata.tables.keys():
-            print(f"  - {table_name}")
+        sys.stdout.write("".join(f"  - {table_name}\n" for table_name in Base.metadata.tables))
     except Exception as e:
         print(f"✗ Error creating database tables: {e}")
         sys.exit(1)
 
 
-def drop_db():
-    """Drop all database tables. WARNING: This will delete all data!"""
+def drop_db(force: bool = False):
+    """
+    Drop all database tables. WARNING: This will delete all data!
+
+    Asks for confirmation unless force=True; without a terminal to ask on, refuses
+    and exits with an error instead.
+    """
     print("WARNING: This will drop all database tables and delete all data!")
-    confirmation = input("Are you sure you want to continue? (yes/no): ")
-    if confirmation.lower() != "yes":
-        print("Operation cancelled.")
-        return
+    if not force:
+        if not sys.stdin.isatty():
+            print("✗ Refusing to drop tables without confirmation; pass --yes to run non-interactively.")
+            sys.exit(1)
+        confirmation = input("Are you sure you want to continue? (yes/no): ")
+        if confirmation.lower() != "yes":
+            print("Operation cancelled.")
+            return
 
     print("Dropping database tables...")
     try:
-        Base.metadata.drop_all(bind=engine)
+        Base.metadata.drop_all(bind=get_engine())
         print("✓ Database tables dropped successfully!")
     except Exception as e:
         print(f"✗ Error dropping database tables: {e}")
@@ -52,7 +61,12 @@ def drop_db():
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == "--drop":
-        drop_db()
+    parser = argparse.ArgumentParser(description="Create (or drop) the loan pre-qualification database tables.")
+    parser.add_argument("--drop", action="store_true", help="drop all tables instead of creating them")
+    parser.add_argument("--yes", "--force", action="store_true", help="do not ask for confirmation before dropping")
+    args = parser.parse_args()
+
+    if args.drop:
+        drop_db(force=args.yes)
     else:
         init_db_verbose()
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import msgspec
+
+
+class ApplicationSubmitted(msgspec.Struct):
+    """
+    Message published to the loan_applications_submitted topic for a stored application.
+
+    Encoded to JSON by the Kafka producer; UUID and datetime fields become strings.
+    """
+
+    application_id: UUID
+    pan_number: str
+    applicant_name: Optional[str]
+    monthly_income: float
+    loan_amount: float
+    loan_type: str
+    status: str
+    created_at: datetime
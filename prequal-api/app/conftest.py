@@ -1,15 +1,12 @@
 import os
 import sys
-import uuid
 from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
-from sqlalchemy.types import CHAR, TypeDecorator
 
 from database import Base, get_db
 
@@ -20,68 +17,44 @@ root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 sys.path.insert(0, root_dir)
 
 
-class GUID(TypeDecorator):
-    """Platform-independent GUID type.
-    Uses PostgreSQL's UUID type, otherwise uses CHAR(36), storing as stringified hex values.
-    """
-
-    impl = CHAR
-    cache_ok = True
-
-    def load_dialect_impl(self, dialect):
-        if dialect.name == "postgresql":
-            return dialect.type_descriptor(UUID())
-        else:
-            return dialect.type_descriptor(CHAR(36))
-
-    def process_bind_param(self, value, dialect):
-        if value is None:
-            return value
-        elif dialect.name == "postgresql":
-            return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            else:
-                return str(value)
-
-    def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
-            else:
-                return value
-
-
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def db_engine():
-    """Create an in-memory SQLite database engine for testing."""
+    """Create an in-memory SQLite database engine shared by the whole test session."""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
 
-    # Replace UUID type with GUID for SQLite compatibility
-    for table in Base.metadata.tables.values():
-        for column in table.columns:
-            if hasattr(column.type, "__class__") and column.type.__class__.__name__ == "UUID":
-                column.type = GUID()
+    # Let SQLAlchemy drive transactions so SAVEPOINTs work with pysqlite
+    @event.listens_for(engine, "connect")
+    def do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
 
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
 
 
 @pytest.fixture(scope="function")
 def db_session(db_engine):
-    """Create a new database session for a test."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-    session = TestingSessionLocal()
+    """
+    Create a database session for a test, rolled back when the test finishes.
+
+    The session joins an outer transaction and turns its own commits into SAVEPOINTs.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, autoflush=False, join_transaction_mode="create_savepoint")
     yield session
     session.close()
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -94,23 +67,25 @@ def mock_kafka_producer():
         yield mock_producer
 
 
+@pytest.fixture(scope="session")
+def test_client():
+    """Create one test client for the FastAPI app, shared by the whole test session."""
+    import main
+
+    return TestClient(main.app)
+
+
 @pytest.fixture(scope="function")
-def client(db_session, mock_kafka_producer):
-    """Create a test client with mocked dependencies."""
+def client(test_client, db_session, mock_kafka_producer):
+    """Return the shared test client wired to this test's database session and mocked Kafka producer."""
     import main
 
     # Override the get_db dependency
     def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+        yield db_session
 
     main.app.dependency_overrides[get_db] = override_get_db
 
-    # Create test client
-    test_client = TestClient(main.app)
-
     yield test_client
 
     # Clean up
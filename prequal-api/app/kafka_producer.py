@@ -1,49 +1,98 @@
-import json
 import logging
 import os
+import threading
 
-from kafka import KafkaProducer
+import msgspec
+from confluent_kafka import Producer
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for delivering queued messages when shutting down
+PRODUCER_FLUSH_TIMEOUT_SECONDS = 30
+
+# Encodes message Structs (and plain dicts) straight to JSON bytes; reused across sends
+_encoder = msgspec.json.Encoder()
+
 
 class PrequalKafkaProducer:
+    """
+    Kafka producer shared by all requests of the process.
+
+    The underlying librdkafka producer is thread-safe, so one instance serves every
+    request thread; connect() is called once from the app lifespan.
+    """
+
     def __init__(self, bootstrap_servers: str = None):
         self.bootstrap_servers = bootstrap_servers or os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
         self.producer = None
+        self._lock = threading.Lock()
 
     def connect(self):
-        try:
-            self.producer = KafkaProducer(
-                bootstrap_servers=self.bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-                key_serializer=lambda k: k.encode("utf-8") if k else None,
-                acks="all",
-                retries=3,
-                max_in_flight_requests_per_connection=1,
-            )
-            logger.info(f"Connected to Kafka at {self.bootstrap_servers}")
-        except Exception as e:
-            logger.error(f"Failed to connect to Kafka: {e}")
-            raise
+        with self._lock:
+            # Concurrent callers share the first producer instead of creating their own
+            if self.producer is not None:
+                return
+            try:
+                self.producer = Producer(
+                    {
+                        "bootstrap.servers": self.bootstrap_servers,
+                        "acks": "all",
+                        # Retries cannot duplicate or reorder messages
+                        "enable.idempotence": True,
+                        # Batch bursts of submissions into fewer, compressed produce requests
+                        "linger.ms": 50,
+                        "batch.size": 262144,
+                        "compression.type": "lz4",
+                    }
+                )
+                logger.info("Connected to Kafka at %s", self.bootstrap_servers)
+            except Exception as e:
+                logger.error("Failed to connect to Kafka: %s", e)
+                raise
 
-    def send_message(self, topic: str, key: str, message: dict):
-        if not self.producer:
+    def send_message(self, topic: str, key: str, message):
+        """
+        Queue a message for delivery without waiting for the broker.
+
+        The outcome is logged by a delivery callback, served from poll() on later sends and on close.
+        """
+        if self.producer is None:
+            # Normally connected by the app lifespan; only reached if that failed
             self.connect()
         try:
-            future = self.producer.send(topic, key=key, value=message)
-            result = future.get(timeout=10)
-            logger.info(f"Message sent to topic {topic} with key {key}: partition={result.partition}, offset={result.offset}")
-            return result
+            # UUIDs and datetimes are serialized natively as ISO strings
+            value = _encoder.encode(message)
+            encoded_key = key.encode("utf-8") if key else None
+            try:
+                self.producer.produce(topic, key=encoded_key, value=value, on_delivery=self._on_delivery)
+            except BufferError:
+                # Local queue is full: let librdkafka deliver some messages, then retry once
+                self.producer.poll(1)
+                self.producer.produce(topic, key=encoded_key, value=value, on_delivery=self._on_delivery)
+            # Serve delivery callbacks of earlier messages without blocking
+            self.producer.poll(0)
         except Exception as e:
-            logger.error(f"Failed to send message to Kafka: {e}")
+            logger.error("Failed to send message to Kafka: %s", e)
             raise
 
+    @staticmethod
+    def _on_delivery(err, msg):
+        key = msg.key().decode("utf-8") if msg.key() else None
+        if err is not None:
+            logger.error("Failed to deliver message to topic %s with key %s: %s", msg.topic(), key, err)
+            return
+        logger.info(
+            "Message sent to topic %s with key %s: partition=%s, offset=%s", msg.topic(), key, msg.partition(), msg.offset()
+        )
+
     def close(self):
-        if self.producer:
-            self.producer.flush()
-            self.producer.close()
-            logger.info("Kafka producer closed")
+        with self._lock:
+            if self.producer:
+                remaining = self.producer.flush(PRODUCER_FLUSH_TIMEOUT_SECONDS)
+                if remaining:
+                    logger.warning("%s Kafka messages were not delivered before shutdown", remaining)
+                self.producer = None
+                logger.info("Kafka producer closed")
 
 
 # Global producer instance
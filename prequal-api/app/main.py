@@ -1,11 +1,18 @@
+import asyncio
 import logging
 import os
+import queue
 import sys
 from contextlib import asynccontextmanager
-from decimal import Decimal
+from logging.handlers import QueueHandler, QueueListener
+from typing import Annotated, List
+from uuid import UUID
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from application_message import ApplicationSubmitted
+from fastapi import BackgroundTasks, Body, Depends, FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from kafka_producer import kafka_producer
 from pydantic_schemas import LoanApplicationRequest, LoanApplicationResponse
 from sqlalchemy.orm import Session
@@ -20,14 +27,80 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Listener thread writing queued log records while the app runs (see lifespan)
+_log_listener = None
+
+# Upper bound on applications accepted by one batch request
+MAX_BATCH_SIZE = 1000
+
+
+def publish_application(application_id: str, kafka_message: ApplicationSubmitted):
+    """
+    Publish a stored application to Kafka; runs as a background task after the response.
+
+    Failures are only logged, since the application is already in the database.
+    """
+    try:
+        kafka_producer.send_message(
+            topic="loan_applications_submitted",
+            key=application_id,
+            message=kafka_message,
+        )
+        logger.info("Application %s queued for Kafka", application_id)
+    except Exception as kafka_error:
+        logger.error("Failed to publish to Kafka: %s", kafka_error)
+        # Continue even if Kafka publish fails - application is already in DB
+        # In production, you might want to implement a retry mechanism
+
+
+def publish_applications(kafka_messages: List[ApplicationSubmitted]):
+    """
+    Publish a batch of stored applications to Kafka; runs as a background task after the response.
+
+    Messages are only queued here; the producer batches them into a few produce requests.
+    """
+    for kafka_message in kafka_messages:
+        publish_application(str(kafka_message.application_id), kafka_message)
+
+
+def start_log_listener():
+    """
+    Route root log records through a queue so request threads only enqueue them.
+
+    The root handlers move to a listener thread that formats and writes the records.
+    Idempotent; stop_log_listener() puts the original handlers back.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+    root_logger = logging.getLogger()
+    handlers = root_logger.handlers[:]
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    root_logger.handlers = [QueueHandler(log_queue)]
+
+
+def stop_log_listener():
+    """
+    Write out queued log records and restore the root handlers replaced by start_log_listener().
+    """
+    global _log_listener
+    if _log_listener is None:
+        return
+    logging.getLogger().handlers = list(_log_listener.handlers)
+    _log_listener.stop()
+    _log_listener = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    start_log_listener()
     logger.info("Starting Prequal API Service...")
     try:
-        # Initialize database
-        init_db()
+        # Initialize database off the event loop; this also opens the first pooled connection
+        await asyncio.to_thread(init_db)
         logger.info("Database initialized successfully")
 
         # Connect to Kafka
@@ -36,7 +109,7 @@ async def lifespan(app: FastAPI):
 
         logger.info("Prequal API Service started successfully")
     except Exception as e:
-        logger.error(f"Failed to start Prequal API Service: {e}")
+        logger.error("Failed to start Prequal API Service: %s", e)
 
     yield
 
@@ -44,6 +117,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Prequal API Service...")
     kafka_producer.close()
     logger.info("Prequal API Service shut down successfully")
+    stop_log_listener()
 
 
 app = FastAPI(
@@ -51,6 +125,7 @@ app = FastAPI(
     description="Loan Pre-Qualification API - Main entry point for loan applications",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -62,6 +137,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (e.g. batch results); small status replies pass through untouched
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
 
 @app.get("/")
 async def root():
@@ -86,15 +164,20 @@ async def health_check():
     response_model=LoanApplicationResponse,
     status_code=status.HTTP_202_ACCEPTED,
 )
-async def create_application(application_request: LoanApplicationRequest, db: Session = Depends(get_db)):
+def create_application(
+    application_request: LoanApplicationRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
     Create a new loan application.
 
     This endpoint:
     1. Validates the application data
     2. Saves the application to the database with PENDING status
-    3. Publishes the application details to Kafka topic 'loan_applications_submitted'
-    4. Returns the application ID and status
+    3. Returns the application ID and status
+    4. Publishes the application details to Kafka topic 'loan_applications_submitted'
+       in the background
 
     The application will be processed asynchronously by:
     - Credit Service (for credit checks)
@@ -102,7 +185,7 @@ async def create_application(application_request: LoanApplicationRequest, db: Se
     """
     try:
         logger.info(
-            f"Received loan application from {application_request.applicant_name} for PAN: {application_request.pan_number}"
+            "Received loan application from %s for PAN: %s", application_request.applicant_name, application_request.pan_number
         )
 
         # Create application in database
@@ -110,94 +193,152 @@ async def create_application(application_request: LoanApplicationRequest, db: Se
             db=db,
             pan_number=application_request.pan_number,
             applicant_name=application_request.applicant_name,
-            monthly_income_inr=Decimal(str(application_request.monthly_income)),
-            loan_amount_inr=Decimal(str(application_request.loan_amount)),
+            monthly_income_inr=application_request.monthly_income,
+            loan_amount_inr=application_request.loan_amount,
             loan_type=application_request.loan_type.value.upper(),
             status="PENDING",
         )
 
-        logger.info(f"Application created in database with ID: {application.id}")
+        logger.info("Application created in database with ID: %s", application.id)
 
         # Prepare Kafka message
-        kafka_message = {
-            "application_id": str(application.id),
-            "pan_number": application.pan_number,
-            "applicant_name": application.applicant_name,
-            "monthly_income": float(application.monthly_income_inr),
-            "loan_amount": float(application.loan_amount_inr),
-            "loan_type": application.loan_type,
-            "status": application.status,
-            "created_at": application.created_at.isoformat(),
-        }
-
-        # Publish to Kafka
-        try:
-            kafka_producer.send_message(
-                topic="loan_applications_submitted",
-                key=str(application.id),
-                message=kafka_message,
-            )
-            logger.info(f"Application {application.id} published to Kafka successfully")
-        except Exception as kafka_error:
-            logger.error(f"Failed to publish to Kafka: {kafka_error}")
-            # Continue even if Kafka publish fails - application is already in DB
-            # In production, you might want to implement a retry mechanism
+        kafka_message = ApplicationSubmitted(
+            application_id=application.id,
+            pan_number=application.pan_number,
+            applicant_name=application.applicant_name,
+            monthly_income=float(application.monthly_income_inr),
+            loan_amount=float(application.loan_amount_inr),
+            loan_type=application.loan_type,
+            status=application.status,
+            created_at=application.created_at,
+        )
 
-        return LoanApplicationResponse(application_id=str(application.id), status=application.status)
+        # Publish to Kafka once the response has been sent
+        background_tasks.add_task(publish_application, str(application.id), kafka_message)
+
+        # Returning the response directly skips FastAPI's response_model validation;
+        # response_model still documents the schema
+        return ORJSONResponse(
+            {"application_id": application.id, "status": application.status}, status_code=status.HTTP_202_ACCEPTED
+        )
 
     except Exception as e:
-        logger.error(f"Error creating loan application: {e}", exc_info=True)
+        logger.error("Error creating loan application: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing application: {str(e)}",
         )
 
 
+@app.post(
+    "/applications/batch",
+    response_model=List[LoanApplicationResponse],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def create_applications_batch(
+    application_requests: Annotated[List[LoanApplicationRequest], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """
+    Create several loan applications in one request.
+
+    All applications are saved with a single INSERT and commit, then published to
+    Kafka in the background like single submissions. The response lists the
+    application IDs in request order.
+    """
+    try:
+        logger.info("Received batch of %s loan applications", len(application_requests))
+
+        rows = [
+            {
+                "pan_number": application_request.pan_number,
+                "applicant_name": application_request.applicant_name,
+                "monthly_income_inr": application_request.monthly_income,
+                "loan_amount_inr": application_request.loan_amount,
+                "loan_type": application_request.loan_type.value.upper(),
+                "status": "PENDING",
+            }
+            for application_request in application_requests
+        ]
+
+        # Create all applications in database
+        created = ApplicationCRUD.bulk_create_applications(db, rows)
+
+        logger.info("Created %s applications in database", len(created))
+
+        # Prepare Kafka messages
+        kafka_messages = [
+            ApplicationSubmitted(
+                application_id=application_id,
+                pan_number=row["pan_number"],
+                applicant_name=row["applicant_name"],
+                monthly_income=float(row["monthly_income_inr"]),
+                loan_amount=float(row["loan_amount_inr"]),
+                loan_type=row["loan_type"],
+                status=row["status"],
+                created_at=created_at,
+            )
+            for row, (application_id, created_at) in zip(rows, created)
+        ]
+
+        # Publish to Kafka once the response has been sent
+        background_tasks.add_task(publish_applications, kafka_messages)
+
+        # Returning the response directly skips FastAPI's response_model validation
+        return ORJSONResponse(
+            [{"application_id": application_id, "status": "PENDING"} for application_id, _ in created],
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+
+    except Exception as e:
+        logger.error("Error creating loan applications: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing applications: {str(e)}",
+        )
+
+
 @app.get(
     "/applications/{application_id}/status",
     response_model=LoanApplicationResponse,
     status_code=status.HTTP_200_OK,
 )
-async def get_application_status(application_id: str, db: Session = Depends(get_db)):
+def get_application_status(application_id: UUID, db: Session = Depends(get_db)):
     """
     Get the current status of a loan application by ID.
 
+    PENDING is always read from the database, so a decision shows up as soon as the
+    decision service writes it; decided statuses may be served from a cache up to
+    STATUS_CACHE_TTL_SECONDS (2s) old.
+
     Args:
-        application_id: UUID of the application
+        application_id: UUID of the application; malformed IDs are rejected with 422
 
     Returns:
         Application ID and current status
     """
     try:
         # Fetch application from database
-        from uuid import UUID
-
-        application_uuid = UUID(application_id)
+        application_status = ApplicationCRUD.get_application_status(db, application_id)
 
-        application = ApplicationCRUD.get_application_by_id(db, application_uuid)
-
-        if not application:
-            logger.warning(f"Application not found: {application_id}")
+        if application_status is None:
+            logger.warning("Application not found: %s", application_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Application {application_id} not found",
             )
 
-        logger.info(f"Retrieved status for application {application_id}: {application.status}")
+        logger.info("Retrieved status for application %s: %s", application_id, application_status)
 
-        return LoanApplicationResponse(application_id=str(application.id), status=application.status)
+        # Returning the response directly skips FastAPI's response_model validation
+        return ORJSONResponse({"application_id": application_id, "status": application_status})
 
     except HTTPException:
-        # Re-raise HTTPException without wrapping (404, 400, etc.)
+        # Re-raise HTTPException without wrapping (404, etc.)
         raise
-    except ValueError:
-        logger.error(f"Invalid UUID format: {application_id}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid application ID format: {application_id}",
-        )
     except Exception as e:
-        logger.error(f"Error fetching application status: {e}", exc_info=True)
+        logger.error("Error fetching application status: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching application status: {str(e)}",
@@ -207,4 +348,14 @@ async def get_application_status(application_id: str, db: Session = Depends(get_
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker unless WEB_CONCURRENCY says otherwise; each worker creates its own engine
+    # (up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections) and Kafka producer in lifespan
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        log_level="warning",
+    )
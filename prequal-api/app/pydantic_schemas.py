@@ -1,6 +1,12 @@
+from decimal import Decimal
 from enum import Enum
+from typing import Annotated
+from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+# Indian PAN: 5 letters, 4 digits, 1 letter; compiled once by pydantic-core's regex engine
+PanNumber = Annotated[str, StringConstraints(pattern=r"^[A-Z]{5}[0-9]{4}[A-Z]{1}$")]
 
 
 class LoanType(str, Enum):
@@ -24,12 +30,13 @@ class LoanApplicationRequest(BaseModel):
     )
 
     applicant_name: str = Field(..., min_length=2, max_length=100)
-    pan_number: str = Field(..., pattern=r"^[A-Z]{5}[0-9]{4}[A-Z]{1}$")
+    pan_number: PanNumber
     loan_type: LoanType
-    loan_amount: float = Field(..., gt=0, le=100000000)
-    monthly_income: float = Field(..., gt=0)
+    # Validated straight into Decimal to match the DECIMAL(12, 2) columns
+    loan_amount: Decimal = Field(..., gt=0, le=100000000)
+    monthly_income: Decimal = Field(..., gt=0)
 
 
 class LoanApplicationResponse(BaseModel):
-    application_id: str
+    application_id: UUID
     status: str = "PENDING"
@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from sqlalchemy import update
+
+from database.crud import ApplicationCRUD
+from database.models import Application
+
+
+def _create_applications(db_session, statuses):
+    """Store one application per status and return their ids."""
+    return [
+        ApplicationCRUD.create_application(
+            db_session,
+            pan_number=f"ABCDE{index:04d}F",
+            applicant_name="Test User",
+            monthly_income_inr=Decimal("50000"),
+            loan_amount_inr=Decimal("500000"),
+            loan_type="PERSONAL",
+            status=application_status,
+        ).id
+        for index, application_status in enumerate(statuses)
+    ]
+
+
+def _all_pages(fetch_page):
+    """Follow the cursors returned by fetch_page(after) and return the ids of every page."""
+    pages = []
+    after = None
+    while True:
+        rows, after = fetch_page(after)
+        pages.append([row.id for row in rows])
+        if after is None:
+            return pages
+        assert len(pages) <= 10, "pagination did not terminate"
+
+
+class TestPagination:
+    """Test cases for keyset pagination of application listings."""
+
+    def test_get_all_applications_pages(self, db_session):
+        """Test that following cursors visits every application once, newest first."""
+        _create_applications(db_session, ["PENDING"] * 5)
+        # Rows created within the same second are ordered by id, which is random within a millisecond
+        newest_first = [row.id for row in ApplicationCRUD.get_all_applications(db_session)[0]]
+
+        pages = _all_pages(lambda after: ApplicationCRUD.get_all_applications(db_session, limit=2, after=after))
+
+        assert len(newest_first) == 5
+        assert pages == [newest_first[0:2], newest_first[2:4], newest_first[4:]]
+
+    def test_get_all_applications_limit_one(self, db_session):
+        """Test that the cursor row is not returned again on the next page."""
+        ids = _create_applications(db_session, ["PENDING"] * 2)
+
+        first_page, cursor = ApplicationCRUD.get_all_applications(db_session, limit=1)
+        second_page, _ = ApplicationCRUD.get_all_applications(db_session, limit=1, after=cursor)
+
+        assert len(first_page) == len(second_page) == 1
+        assert {first_page[0].id, second_page[0].id} == set(ids)
+
+    def test_get_applications_by_status_summary_pages(self, db_session):
+        """Test paging one status with only the summary columns loaded."""
+        statuses = ["PENDING", "REJECTED", "PENDING", "PENDING", "PRE_APPROVED", "PENDING"]
+        _create_applications(db_session, statuses)
+        newest_first = [row.id for row in ApplicationCRUD.get_applications_by_status(db_session, "PENDING")[0]]
+
+        pages = _all_pages(
+            lambda after: ApplicationCRUD.get_applications_by_status(
+                db_session, "PENDING", limit=2, after=after, summary_only=True
+            )
+        )
+
+        assert len(newest_first) == 4
+        # A full last page still returns a cursor; the page after it is empty
+        assert pages == [newest_first[0:2], newest_first[2:4], []]
+
+
+class TestApplicationStatusCache:
+    """Test cases for the status lookup cache."""
+
+    @staticmethod
+    def _update_elsewhere(db_session, application_id, application_status):
+        """Change a status without going through ApplicationCRUD, like the decision service does."""
+        db_session.execute(update(Application).where(Application.id == application_id).values(status=application_status))
+
+    def test_pending_status_is_not_cached(self, db_session):
+        """Test that a decision written by another process is visible on the next lookup."""
+        (application_id,) = _create_applications(db_session, ["PENDING"])
+        assert ApplicationCRUD.get_application_status(db_session, application_id) == "PENDING"
+
+        self._update_elsewhere(db_session, application_id, "PRE_APPROVED")
+
+        assert ApplicationCRUD.get_application_status(db_session, application_id) == "PRE_APPROVED"
+
+    def test_decided_status_is_cached(self, db_session):
+        """Test that decided statuses are served from the cache within the TTL."""
+        (application_id,) = _create_applications(db_session, ["REJECTED"])
+        assert ApplicationCRUD.get_application_status(db_session, application_id) == "REJECTED"
+
+        self._update_elsewhere(db_session, application_id, "MANUAL_REVIEW")
+
+        assert ApplicationCRUD.get_application_status(db_session, application_id) == "REJECTED"
@@ -1,6 +1,9 @@
+import logging
+from logging.handlers import QueueHandler
 from uuid import uuid4
 
 from fastapi import status
+from main import start_log_listener, stop_log_listener
 
 from database.crud import ApplicationCRUD
 
@@ -161,6 +164,40 @@ class TestCreateApplication:
         assert data["status"] == "PENDING"
 
 
+class TestCreateApplicationsBatch:
+    """Test cases for the batch submission endpoint."""
+
+    def test_create_applications_batch_success(self, client, sample_application_data_list, mock_kafka_producer):
+        """Test that a batch is stored and every application is published."""
+        response = client.post("/applications/batch", json=sample_application_data_list)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        data = response.json()
+        assert len(data) == 3
+        assert all(item["status"] == "PENDING" for item in data)
+
+        # Each returned ID can be looked up, and Kafka got one message per application
+        for item in data:
+            assert client.get(f"/applications/{item['application_id']}/status").status_code == status.HTTP_200_OK
+        assert mock_kafka_producer.send_message.call_count == 3
+        published = [call.kwargs["message"].pan_number for call in mock_kafka_producer.send_message.call_args_list]
+        assert published == [application["pan_number"] for application in sample_application_data_list]
+
+    def test_create_applications_batch_empty(self, client):
+        """Test that an empty batch is rejected."""
+        response = client.post("/applications/batch", json=[])
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_create_applications_batch_invalid_item(self, client, sample_application_data_list, mock_kafka_producer):
+        """Test that one invalid application rejects the whole batch."""
+        sample_application_data_list[1]["pan_number"] = "INVALID"
+
+        response = client.post("/applications/batch", json=sample_application_data_list)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_kafka_producer.send_message.assert_not_called()
+
+
 class TestGetApplicationStatus:
     """Test cases for retrieving application status."""
 
@@ -189,16 +226,17 @@ class TestGetApplicationStatus:
         """Test retrieval with invalid UUID format."""
         invalid_id = "not-a-valid-uuid"
         response = client.get(f"/applications/{invalid_id}/status")
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "invalid" in response.json()["detail"].lower()
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["loc"] == ["path", "application_id"]
 
     def test_get_application_status_after_update(self, client, db_session, sample_application_data):
         """Test that status changes are reflected in the API."""
         # Create an application
         create_response = client.post("/applications", json=sample_application_data)
         application_id = create_response.json()["application_id"]
+        assert client.get(f"/applications/{application_id}/status").json()["status"] == "PENDING"
 
-        # Update the application status in the database
+        # Update the application status in the database; this also drops the cached status
         from uuid import UUID
 
         ApplicationCRUD.update_application_status(
@@ -213,3 +251,21 @@ class TestGetApplicationStatus:
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["status"] == "PRE_APPROVED"
+
+
+class TestLogListener:
+    """Test cases for the queued logging set up by the app lifespan."""
+
+    def test_log_listener_restores_root_handlers(self):
+        root_logger = logging.getLogger()
+        original_handlers = root_logger.handlers[:]
+
+        start_log_listener()
+        start_log_listener()  # idempotent: a second call must not wrap the queue handler again
+        try:
+            assert len(root_logger.handlers) == 1
+            assert isinstance(root_logger.handlers[0], QueueHandler)
+        finally:
+            stop_log_listener()
+
+        assert root_logger.handlers == original_handlers